@@ -1,9 +1,10 @@
-here#!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 إعدادات النظام المعدلة لـ Replit
 """
 
 import os
+from pathlib import Path
 from typing import Dict, Any
 
 class ReplitSettings:
@@ -16,15 +17,86 @@ class ReplitSettings:
     # إعدادات النظام
     APP_NAME = "QuantumOSINT - Replit Edition"
     VERSION = "1.0.0-replit"
+
+    # جذر المشروع؛ مسارات البيانات تحسب منه وليس من مجلد التشغيل الحالي
+    BASE_DIR = Path(__file__).resolve().parent.parent
     
     # إعدادات الأداء لـ Replit
     MAX_CONCURRENT_REQUESTS = 10  # أقل بسبب قيود Replit
     REQUEST_TIMEOUT = 20
     MAX_RETRY_ATTEMPTS = 3
     
+    # إعدادات جدولة الأهداف: الوزن الأعلى = حصة أكبر من الفتحات المتزامنة
+    SCHEDULER_WEIGHTS = {
+        'email': 4,
+        'phone': 4,
+        'username': 1,
+        'unknown': 1
+    }
+    SCHEDULER_MAX_IN_FLIGHT = {  # حد أقصى اختياري للمهام الجارية لكل نوع
+        'username': 5
+    }
+    SCAN_DEADLINE = None  # ثواني؛ None = بدون مهلة
+    
+    # التحكم التكيفي في التزامن (AIMD) ضمن حد MAX_CONCURRENT_REQUESTS
+    ADAPTIVE_CONCURRENCY = True
+    ADAPTIVE_INITIAL_CONCURRENCY = 4
+    ADAPTIVE_DECISION_INTERVAL = 2.0  # ثواني بين القرارات
+    ADAPTIVE_DECREASE_FACTOR = 0.5  # التخفيض الضربي عند الازدحام
+    ADAPTIVE_MIN_FREE_MEMORY_PERCENT = 10
+    ADAPTIVE_MAX_LOOP_LAG = 0.2  # ثواني
+    ADAPTIVE_MAX_ERROR_RATE = 0.25
+    ADAPTIVE_LATENCY_TOLERANCE = 2.0  # مضاعف زمن الاستجابة الأساسي
+    ADAPTIVE_MIN_LATENCY_DELTA = 0.05  # أقل زيادة (ثواني) فوق الأساس تعتبر ازدحاماً
+    ADAPTIVE_BASELINE_WINDOWS = 20  # خط الأساس = أدنى وسيط في آخر N نافذة قرار
+    
+    # إعدادات المسح الموزع
+    SCAN_WORKERS = int(os.getenv('QUANTUM_WORKERS', '1'))  # 1 = بدون توزيع
+    BROKER_PATH = os.getenv('QUANTUM_BROKER', str(BASE_DIR / 'data' / 'broker.db'))
+    BROKER_LEASE_SECONDS = 60  # تعاد المهام للطابور إن لم يجدد العامل عقده
+    BROKER_BATCH_SIZE = 5
+    BROKER_MAX_RESPAWNS = 3  # إعادة تشغيل العمال المتوقفين دون تقدم قبل إفشال المسح
+    
+    # إعدادات فحص الاتصال
+    OFFLINE_MODE = os.getenv('QUANTUM_OFFLINE', '0') == '1'  # الإجابة من التخزين المؤقت فقط
+    CONNECTIVITY_CHECK_TTL = 300  # ثواني قبل إعادة الفحص
+    CONNECTIVITY_CHECK_TIMEOUT = 5
+    CONNECTIVITY_CHECK_URLS = {  # None = النوع لا يحتاج فحصاً
+        'email': None,
+        'username': 'https://api.github.com',
+        'phone': None
+    }
+    
+    # إعدادات التسجيل
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # تدوير الملف عند هذا الحجم
+    LOG_BACKUP_COUNT = 5
+    LOG_WARNING_BURST = 10  # عدد التحذيرات المسموحة من نفس السطر لكل نافذة
+    LOG_WARNING_WINDOW = 60  # ثواني
+    
     # إعدادات التخزين
     DATABASE_URL = "sqlite:///./quantum_osint.db"
     CACHE_DIR = "./cache"
+    CACHE_TTL = 24 * 3600  # صلاحية استجابات المنصات المخزنة
+    INDEX_DB_PATH = str(BASE_DIR / 'data' / 'results_index.db')  # فهرس البحث في النتائج السابقة
+    
+    # رمز الدولة المستخدم للأرقام المحلية التي تبدأ بـ 0 (مثال: '967')
+    DEFAULT_PHONE_COUNTRY_CODE = os.getenv('QUANTUM_DEFAULT_CC')
+    
+    # إعدادات WHOIS/RDAP
+    RDAP_BASE_URL = os.getenv('QUANTUM_RDAP_URL', 'https://rdap.org')
+    WHOIS_DB_PATH = str(BASE_DIR / 'data' / 'whois.db')
+    WHOIS_CACHE_TTL = 30 * 24 * 3600  # بيانات التسجيل نادراً ما تتغير
+    WHOIS_NEGATIVE_CACHE_TTL = 24 * 3600  # نتيجة "غير مسجل" قد تتغير أو تكون خاطئة
+    WHOIS_REGISTRY_CONCURRENCY = 2  # طلبات متزامنة لكل سجل (TLD)
+    
+    # سياسات الاحتفاظ بالملفات (مجلد data غير مشمول لأنه يحوي قواعد البيانات)
+    MAINTENANCE_INTERVAL = 3600  # ثواني بين دورات الصيانة
+    RETENTION_POLICIES = {
+        'cache': {'max_age_days': 7, 'max_size_mb': 200},
+        'exports': {'max_age_days': 180, 'max_size_mb': 2048, 'compact_after_days': 1},
+        'reports': {'max_age_days': 90, 'max_size_mb': 1024, 'compact_after_days': 1},
+        'logs': {'max_age_days': 30, 'max_size_mb': 200, 'protect': ['quantum_osint.log']}
+    }
     
     # إعدادات المنصات المدعومة
     PLATFORMS = {
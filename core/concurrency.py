@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+تحكم تكيفي في عدد الأهداف الجارية (زيادة جمعية / تخفيض ضربي)
+"""
+
+import time
+import asyncio
+import logging
+import statistics
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from config.settings import settings
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class AdaptiveConcurrencyController:
+    """ضبط حد التزامن أثناء المسح حسب صحة النظام والخدمات الخارجية
+
+    يرفع الحد بواحد بعد كل نافذة سليمة، ويخفضه ضربياً عند نقص الذاكرة أو
+    تأخر حلقة الأحداث أو ارتفاع نسبة الأخطاء أو زمن الاستجابة.
+    """
+
+    def __init__(self, max_limit: Optional[int] = None, min_limit: int = 1, initial: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_limit = max_limit or settings.MAX_CONCURRENT_REQUESTS
+        self.min_limit = min_limit
+        self.limit = max(min_limit, min(initial or settings.ADAPTIVE_INITIAL_CONCURRENCY, self.max_limit))
+
+        self.loop_lag = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.decisions = deque(maxlen=20)
+
+        # زمن الاستجابة لكل نوع هدف: النوع -> (عينات النافذة الحالية, وسطاء النوافذ السابقة)
+        self._latency = {}
+        self._window_total = 0
+        self._window_errors = 0
+        self._last_decision = time.monotonic()
+        self._last_decrease = 0.0
+        self._lag_task = None
+
+    def start(self):
+        """بدء قياس تأخر حلقة الأحداث"""
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.ensure_future(self._sample_loop_lag())
+
+    def stop(self):
+        """إيقاف القياس"""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+
+    async def _sample_loop_lag(self, interval: float = 0.25):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - started - interval, 0)
+            self.loop_lag = 0.7 * self.loop_lag + 0.3 * lag
+
+    def record(self, latency: float, error: bool, kind: str = 'default', started: Optional[float] = None):
+        """تسجيل اكتمال هدف واتخاذ قرار عند نهاية النافذة"""
+        # المهام التي بدأت قبل آخر تخفيض تعكس الحمل السابق وليس الحد الحالي
+        if started is not None and started < self._last_decrease:
+            return
+
+        if kind not in self._latency:
+            self._latency[kind] = ([], deque(maxlen=settings.ADAPTIVE_BASELINE_WINDOWS))
+        self._latency[kind][0].append(latency)
+
+        self._window_total += 1
+        if error:
+            self._window_errors += 1
+
+        # قرار واحد لكل نافذة تضم على الأقل عينة لكل فتحة حتى يظهر أثر القرار السابق
+        now = time.monotonic()
+        if self._window_total >= self.limit and (
+            now - self._last_decision >= settings.ADAPTIVE_DECISION_INTERVAL or self._window_total >= self.limit * 2
+        ):
+            self._decide(now)
+
+    def _congestion_reason(self) -> Optional[str]:
+        """سبب الازدحام الحالي أو None إن كان النظام سليماً"""
+        if psutil is not None:
+            memory = psutil.virtual_memory()
+            if memory.available / memory.total * 100 < settings.ADAPTIVE_MIN_FREE_MEMORY_PERCENT:
+                return 'memory'
+
+        if self.loop_lag > settings.ADAPTIVE_MAX_LOOP_LAG:
+            return 'loop_lag'
+
+        if self._window_total and self._window_errors / self._window_total > settings.ADAPTIVE_MAX_ERROR_RATE:
+            return 'errors'
+
+        # وسيط النافذة الحالية مقابل أدنى وسيط في النوافذ الأخيرة: الوسيط لا
+        # يتأثر بقيمة شاذة واحدة، والأدنى لا يرتفع مع الزيادة الجمعية فيكشف
+        # الازدحام الذي يسببه المتحكم نفسه، والفرق المطلق يمنع التخفيض عند
+        # أزمنة صغيرة جداً
+        for kind, (samples, medians) in self._latency.items():
+            if len(samples) < 3 or not medians:
+                continue
+            current, baseline = statistics.median(samples), min(medians)
+            if (current > baseline * settings.ADAPTIVE_LATENCY_TOLERANCE
+                    and current - baseline > settings.ADAPTIVE_MIN_LATENCY_DELTA):
+                return f'latency:{kind}'
+
+        return None
+
+    def _decide(self, now: float):
+        previous = self.limit
+        reason = self._congestion_reason()
+
+        if reason:
+            self.limit = max(self.min_limit, int(self.limit * settings.ADAPTIVE_DECREASE_FACTOR))
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+        if self.limit != previous:
+            if self.limit > previous:
+                self.increases += 1
+            else:
+                self.decreases += 1
+                self._last_decrease = now
+                self.logger.info(f"📉 خفض التزامن {previous} -> {self.limit} ({reason})")
+
+            self.decisions.append({
+                'time': datetime.now().isoformat(),
+                'from': previous,
+                'to': self.limit,
+                'reason': reason or 'healthy'
+            })
+
+        # كل نافذة تقاس تحت حد واحد؛ وسيطها يضاف لتاريخ خط الأساس
+        for samples, medians in self._latency.values():
+            if len(samples) >= 3:
+                medians.append(statistics.median(samples))
+            samples.clear()
+
+        self._window_total = 0
+        self._window_errors = 0
+        self._last_decision = now
+
+    def stats(self) -> Dict[str, Any]:
+        """حالة المتحكم لعرضها في الإحصائيات"""
+        return {
+            'concurrency_limit': self.limit,
+            'concurrency_max': self.max_limit,
+            'concurrency_increases': self.increases,
+            'concurrency_decreases': self.decreases,
+            'loop_lag_ms': round(self.loop_lag * 1000, 1),
+            'latency_ms': {kind: round(medians[-1] * 1000) for kind, (_, medians) in self._latency.items() if medians},
+            'recent_decisions': list(self.decisions)[-5:]
+        }
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+توزيع المسح على عدة عمليات أو عقد عبر وسيط مهام بسيط
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import asyncio
+import logging
+import socket
+import sqlite3
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+
+from config.settings import settings
+from utils.helpers import ScanSummary
+from utils.logging_setup import current_scan_id, setup_logging
+
+class SQLiteBroker:
+    """طابور مهام على SQLite مع عقود ونبضات
+
+    يكفي للاختبار المحلي ولعدة عقد تشترك في نظام ملفات. أي كائن يوفر نفس
+    الدوال (submit/lease/heartbeat/complete/cancel/completed/results/unfinished_count) يمكن
+    استخدامه بدلاً منه، مثل تطبيق فوق Redis.
+    """
+
+    def __init__(self, db_path: str = None, lease_seconds: float = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = str(db_path or settings.BROKER_PATH)
+        self.lease_seconds = lease_seconds or settings.BROKER_LEASE_SECONDS
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """اتصال جديد لكل عملية حتى يبقى الوسيط آمناً بين الخيوط والعمليات"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _create_schema(self):
+        """إنشاء جدول المهام"""
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_id TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_scan_status ON tasks (scan_id, status)')
+        finally:
+            conn.close()
+
+    def submit(self, scan_id: str, targets: List[str]):
+        """إضافة أهداف المسح إلى الطابور"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT INTO tasks (scan_id, target) VALUES (?, ?)',
+                [(scan_id, target) for target in targets]
+            )
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def lease(self, worker_id: str, limit: int = None, scan_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """حجز دفعة من المهام المعلقة أو التي انتهى عقدها"""
+        limit = limit or settings.BROKER_BATCH_SIZE
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+
+            query = """
+                SELECT id, scan_id, target, attempts FROM tasks
+                WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+            """
+            params = [now]
+            if scan_id:
+                query += ' AND scan_id = ?'
+                params.append(scan_id)
+            query += ' ORDER BY id LIMIT ?'
+            params.append(limit)
+            rows = conn.execute(query, params).fetchall()
+
+            leased = []
+            for task_id, task_scan_id, target, attempts in rows:
+                # المهام التي أسقطت العمال مراراً تعلم كفاشلة
+                if attempts >= settings.MAX_RETRY_ATTEMPTS:
+                    conn.execute(
+                        "UPDATE tasks SET status = 'failed', result = ? WHERE id = ?",
+                        (json.dumps({'target': target, 'error': 'تجاوز عدد المحاولات'}, ensure_ascii=False), task_id)
+                    )
+                    continue
+
+                conn.execute(
+                    """UPDATE tasks SET status = 'leased', worker_id = ?, lease_expires = ?,
+                       attempts = attempts + 1 WHERE id = ?""",
+                    (worker_id, now + self.lease_seconds, task_id)
+                )
+                leased.append({'id': task_id, 'scan_id': task_scan_id, 'target': target})
+
+            conn.execute('COMMIT')
+            return leased
+        finally:
+            conn.close()
+
+    def heartbeat(self, worker_id: str) -> int:
+        """تجديد عقود كل مهام العامل"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE worker_id = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, worker_id)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def complete(self, task_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """تسجيل نتيجة مهمة ما زالت محجوزة لهذا العامل"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL
+                   WHERE id = ? AND worker_id = ? AND status = 'leased'""",
+                (json.dumps(result, ensure_ascii=False, default=str), task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def cancel(self, scan_id: str) -> List[str]:
+        """إلغاء مهام المسح غير المنجزة وإعادة أهدافها"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                "SELECT target FROM tasks WHERE scan_id = ? AND status IN ('pending', 'leased') ORDER BY id",
+                (scan_id,)
+            ).fetchall()
+            conn.execute(
+                "UPDATE tasks SET status = 'cancelled', lease_expires = NULL WHERE scan_id = ? AND status IN ('pending', 'leased')",
+                (scan_id,)
+            )
+            conn.execute('COMMIT')
+            return [target for target, in rows]
+        finally:
+            conn.close()
+
+    def unfinished_count(self, scan_id: str) -> int:
+        """عدد المهام التي لم تنته بعد"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE scan_id = ? AND status IN ('pending', 'leased')",
+                (scan_id,)
+            ).fetchone()
+            return row[0]
+        finally:
+            conn.close()
+
+    def completed(self, scan_id: str, seen: set) -> List[tuple]:
+        """المهام المنتهية التي ليست في seen: [(المعرف، الهدف، النتيجة)]"""
+        conn = self._connect()
+        try:
+            ids = [
+                task_id for task_id, in conn.execute(
+                    'SELECT id FROM tasks WHERE scan_id = ? AND result IS NOT NULL', (scan_id,)
+                )
+                if task_id not in seen
+            ]
+            rows = []
+            # حد SQLite لعدد المعاملات في الاستعلام الواحد
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows += conn.execute(
+                    f"SELECT id, target, result FROM tasks WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                    chunk
+                ).fetchall()
+            return [(task_id, target, json.loads(result)) for task_id, target, result in rows]
+        finally:
+            conn.close()
+
+    def results(self, scan_id: str) -> Dict[str, Dict[str, Any]]:
+        """نتائج المسح مفهرسة بالهدف"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT target, result FROM tasks WHERE scan_id = ? AND result IS NOT NULL ORDER BY id",
+                (scan_id,)
+            ).fetchall()
+            return {target: json.loads(result) for target, result in rows}
+        finally:
+            conn.close()
+
+class ScanWorker:
+    """عامل يسحب المهام من الوسيط ويعالجها بمحركه الخاص"""
+
+    def __init__(self, broker: SQLiteBroker, scan_id: Optional[str] = None, worker_id: Optional[str] = None,
+                 workers: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.broker = broker
+        self.scan_id = scan_id
+        # عدد العمال المشتركين في المسح، لحجز حصة عادلة من المهام
+        self.workers = workers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    async def run(self, engine=None) -> int:
+        """المعالجة حتى يفرغ الطابور؛ يعيد عدد المهام المنجزة"""
+        if engine is None:
+            from core.replit_engine import QuantumReplitEngine
+            engine = QuantumReplitEngine()
+
+        from core.scheduler import TargetScheduler
+
+        loop = asyncio.get_running_loop()
+        heartbeat = asyncio.ensure_future(self._heartbeat_loop())
+        processed = 0
+        await engine.initialize({'email', 'username', 'phone'})
+        try:
+            while True:
+                batch_size = await loop.run_in_executor(None, self._batch_size)
+                tasks = await loop.run_in_executor(None, self.broker.lease, self.worker_id, batch_size, self.scan_id)
+                if not tasks:
+                    # انتظار انتهاء عقود العمال المتوقفين قبل الخروج
+                    if self.scan_id and await loop.run_in_executor(None, self.broker.unfinished_count, self.scan_id):
+                        await asyncio.sleep(1)
+                        continue
+                    break
+
+                leased = {task['target']: task for task in tasks}
+
+                async def process(target):
+                    # كل هدف يعمل في مهمة خاصة، فيبقى scan_id داخل سياقها
+                    current_scan_id.set(leased[target]['scan_id'])
+                    return await engine.process_target(target)
+
+                scheduler = TargetScheduler(process, controller=engine.concurrency)
+                for target in leased:
+                    scheduler.add(target, engine.detect_target_type(target))
+
+                async for target, result in scheduler.run():
+                    await loop.run_in_executor(None, self.broker.complete, leased[target]['id'], self.worker_id, result)
+                    processed += 1
+        finally:
+            heartbeat.cancel()
+            await engine.cleanup()
+
+        self.logger.info(f"👷 العامل {self.worker_id} أنجز {processed} مهمة")
+        return processed
+
+    def _batch_size(self) -> int:
+        """حجم الدفعة التالية
+
+        دفعة تكفي لملء فتحات التزامن حتى لا يعالج العامل هدفاً واحداً في كل
+        مرة، لكنها لا تتجاوز حصته من المهام المتبقية حتى يتوزع المسح الصغير
+        على كل العمال.
+        """
+        batch_size = max(settings.BROKER_BATCH_SIZE, settings.MAX_CONCURRENT_REQUESTS)
+        if self.scan_id and self.workers:
+            unfinished = self.broker.unfinished_count(self.scan_id)
+            batch_size = min(batch_size, max(math.ceil(unfinished / self.workers), 1))
+        return batch_size
+
+    async def _heartbeat_loop(self):
+        """تجديد العقود دورياً ما دام العامل حياً"""
+        loop = asyncio.get_running_loop()
+        interval = max(self.broker.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self.broker.heartbeat, self.worker_id)
+            except sqlite3.Error as e:
+                self.logger.warning(f"فشل تجديد العقد: {e}")
+
+def _worker_main(db_path: str, scan_id: Optional[str], workers: Optional[int] = None):
+    """نقطة دخول عملية العامل"""
+    # تدوير ملف السجل المشترك من عدة عمليات يفقد السجلات، لذا لكل عامل ملفه
+    setup_logging(Path(__file__).parent.parent / 'logs', filename=f'worker_{os.getpid()}.log')
+    # سجلات تهيئة العامل وإنهائه تحمل معرف المسح أيضاً (asyncio.run ينسخ السياق)
+    if scan_id:
+        current_scan_id.set(scan_id)
+    broker = SQLiteBroker(db_path)
+    asyncio.run(ScanWorker(broker, scan_id, workers=workers).run())
+
+async def distributed_scan(engine, targets: List[str], workers: int, broker: Optional[SQLiteBroker] = None,
+                           deadline: Optional[float] = None,
+                           on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """تقسيم الأهداف على عدة عمليات عاملة ودمج النتائج في ملخص واحد
+
+    عند انتهاء المهلة تلغى المهام المتبقية وتوقف العمال وتحفظ أهدافها في
+    results['unfinished']. on_progress يستقبل حدثاً لكل هدف منجز بنفس صيغة
+    أحداث scan_stream.
+    """
+    logger = logging.getLogger(__name__)
+    broker = broker or SQLiteBroker()
+    loop = asyncio.get_running_loop()
+    deadline = deadline or settings.SCAN_DEADLINE
+    end_time = loop.time() + deadline if deadline else None
+
+    scan_id = f"scan_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:6]}"
+    token = current_scan_id.set(scan_id)
+    try:
+        results = {
+            'scan_id': scan_id,
+            'start_time': datetime.now().isoformat(),
+            'targets': targets,
+            'workers': workers,
+            'results': {}
+        }
+
+        valid_targets = []
+        # مهمة واحدة لكل هدف؛ المكررات تفسد ربط المهام بالأهداف داخل العامل
+        for target in dict.fromkeys(targets):
+            if not engine.security.validate_target(target):
+                logger.warning(f"هدف غير صالح تم تخطيه: {target}")
+                continue
+            valid_targets.append(target)
+
+        await loop.run_in_executor(None, broker.submit, scan_id, valid_targets)
+        logger.info(f"🧩 توزيع {len(valid_targets)} هدف على {workers} عامل")
+
+        # spawn بدلاً من fork لتجنب نسخ خيوط الكاتب والتسجيل
+        context = multiprocessing.get_context('spawn')
+        processes = []
+
+        def spawn_worker():
+            process = context.Process(target=_worker_main, args=(broker.db_path, scan_id, workers), daemon=True)
+            process.start()
+            processes.append(process)
+
+        for _ in range(workers):
+            spawn_worker()
+
+        summary = ScanSummary()
+        seen = set()
+        started = time.monotonic()
+
+        async def report_progress():
+            """إرسال حدث لكل هدف اكتمل منذ آخر فحص"""
+            if on_progress is None:
+                return
+            for task_id, target, result in await loop.run_in_executor(None, broker.completed, scan_id, seen):
+                seen.add(task_id)
+                summary.add(result)
+                on_progress({
+                    'scan_id': scan_id,
+                    'target': target,
+                    'result': result,
+                    'completed': summary.total_targets,
+                    'total': len(valid_targets),
+                    'elapsed': time.monotonic() - started,
+                    'concurrency': sum(p.is_alive() for p in processes),
+                    'summary': summary.as_dict()
+                })
+
+        # عدد مرات توقف كل العمال دون أي تقدم منذ آخر إعادة تشغيل
+        failed_respawns = 0
+        unfinished_at_respawn = None
+        timed_out = False
+
+        try:
+            while True:
+                await report_progress()
+                unfinished = await loop.run_in_executor(None, broker.unfinished_count, scan_id)
+                if unfinished == 0:
+                    break
+
+                if end_time is not None and loop.time() >= end_time:
+                    logger.warning(f"⏰ انتهت مهلة المسح الموزع مع {unfinished} هدف غير منجز")
+                    results['unfinished'] = await loop.run_in_executor(None, broker.cancel, scan_id)
+                    timed_out = True
+                    break
+
+                if not any(p.is_alive() for p in processes):
+                    if unfinished_at_respawn is not None and unfinished >= unfinished_at_respawn:
+                        failed_respawns += 1
+                    else:
+                        failed_respawns = 0
+
+                    if failed_respawns >= settings.BROKER_MAX_RESPAWNS:
+                        exit_codes = [p.exitcode for p in processes[-workers:]]
+                        raise RuntimeError(f"توقف العمال دون تقدم {failed_respawns} مرات (رموز الخروج: {exit_codes})")
+
+                    # كل العمال توقفوا ومهامهم ستعود للطابور بعد انتهاء العقد
+                    logger.warning("⚠️ توقف كل العمال، تشغيل عامل بديل")
+                    unfinished_at_respawn = unfinished
+                    spawn_worker()
+                await asyncio.sleep(0.5)
+        finally:
+            # انتظار خروج العمال دون حجب حلقة الأحداث ثم إنهاء المتأخرين
+            join_until = loop.time() + (0 if timed_out else 5)
+            while any(p.is_alive() for p in processes) and loop.time() < join_until:
+                await asyncio.sleep(0.1)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                await loop.run_in_executor(None, process.join)
+
+        await report_progress()
+        results['results'] = await loop.run_in_executor(None, broker.results, scan_id)
+        results['end_time'] = datetime.now().isoformat()
+        results['summary'] = engine.generate_summary(results['results'])
+
+        await engine.save_results(results)
+        return results
+    finally:
+        current_scan_id.reset(token)
+
+def main():
+    """تشغيل عامل مستقل على عقدة أخرى تشترك في ملف الوسيط"""
+    parser = argparse.ArgumentParser(description='QuantumOSINT scan worker')
+    parser.add_argument('--broker', default=settings.BROKER_PATH, help='مسار قاعدة بيانات الوسيط')
+    parser.add_argument('--scan-id', default=None, help='معالجة مهام مسح محدد فقط')
+    args = parser.parse_args()
+
+    _worker_main(args.broker, args.scan_id)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,28 +3,38 @@
 المحرك الرئيسي المعدل لبيئة Replit
 """
 
+import time
 import asyncio
 import aiohttp
 import json
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
 
 from config.settings import settings
 from utils.replit_helper import ReplitEnvironment, ReplitSecurity
+from utils.helpers import ResponseCache, ScanSummary, get_file_writer
+from utils.logging_setup import current_scan_id, current_target
+from core.scheduler import TargetScheduler
+from core.concurrency import AdaptiveConcurrencyController
 
 class QuantumReplitEngine:
     """محرك QuantumOSINT مخصص لـ Replit"""
     
-    def __init__(self):
+    def __init__(self, environment: Optional[ReplitEnvironment] = None):
         self.logger = logging.getLogger(__name__)
-        self.environment = ReplitEnvironment()
+        self.environment = environment or ReplitEnvironment()
         self.security = ReplitSecurity()
         
         # إعدادات المحرك
         self.session = None
         self.active_tasks = []
         self.scan_results = {}
+        self.connectivity_checks = {}
+        self.cache = ResponseCache(ttl=settings.CACHE_TTL)
+        
+        # حد التزامن التكيفي يبقى بين عمليات المسح
+        self.concurrency = AdaptiveConcurrencyController() if settings.ADAPTIVE_CONCURRENCY else None
         
         # إعداد المكونات
         self.setup_components()
@@ -47,15 +57,28 @@ class QuantumReplitEngine:
             self.logger.info("✅ Email analyzer loaded")
         except ImportError as e:
             self.logger.warning(f"Email analyzer not available: {e}")
+        
+        try:
+            from plugins.data_sources.phone_analyzer import PhoneIntelligence
+            self.phone_analyzer = PhoneIntelligence()
+            self.logger.info("✅ Phone analyzer loaded")
+        except ImportError as e:
+            self.logger.warning(f"Phone analyzer not available: {e}")
     
-    async def initialize(self):
+    async def initialize(self, target_types: Optional[set] = None):
         """تهيئة المحرك"""
         self.logger.info("🚀 تهيئة محرك QuantumOSINT...")
+        self.connectivity_checks = {}
         
-        # فحص اتصال الإنترنت
-        if not await self.environment.check_internet():
-            self.logger.error("❌ لا يوجد اتصال بالإنترنت")
-            return False
+        if settings.OFFLINE_MODE:
+            self.logger.info("📴 وضع عدم الاتصال: الإجابة من التخزين المحلي فقط")
+            return True
+        
+        # فحص الاتصال في الخلفية للأنواع التي تحتاج الشبكة فقط
+        for target_type in target_types or []:
+            url = settings.CONNECTIVITY_CHECK_URLS.get(target_type)
+            if url:
+                self.connectivity_checks[target_type] = self.environment.start_connectivity_check(url)
         
         # إعداد جلسة HTTP
         self.session = aiohttp.ClientSession(
@@ -65,50 +88,110 @@ class QuantumReplitEngine:
         self.logger.info("✅ اكتملت التهيئة بنجاح")
         return True
     
-    async def comprehensive_scan(self, targets: List[str]) -> Dict[str, Any]:
+    async def comprehensive_scan(self, targets: List[str], workers: Optional[int] = None,
+                                 deadline: Optional[float] = None,
+                                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """مسح شامل للأهداف"""
         self.logger.info(f"🎯 بدء المسح الشامل لـ {len(targets)} هدف")
         
-        if not await self.initialize():
-            return {'error': 'فشل تهيئة النظام'}
+        # توزيع المسح على عدة عمليات عاملة عند الطلب
+        workers = workers or settings.SCAN_WORKERS
+        if workers > 1:
+            from core.distributed import distributed_scan
+            try:
+                return await distributed_scan(self, targets, workers, deadline=deadline, on_progress=on_progress)
+            except Exception as e:
+                self.logger.error(f"❌ فشل المسح الموزع: {e}")
+                return {'error': str(e)}
         
+        results = {}
         try:
-            scan_id = f"scan_{int(datetime.now().timestamp())}"
-            results = {
+            async for event in self.scan_stream(targets, deadline, results):
+                if on_progress:
+                    on_progress(event)
+            
+            # حفظ النتائج
+            await self.save_results(results)
+            
+            self.logger.info("✅ اكتمل المسح الشامل بنجاح")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"❌ فشل المسح الشامل: {e}")
+            return {'error': str(e)}
+    
+    async def scan_stream(self, targets: List[str], deadline: Optional[float] = None,
+                          results: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """مسح الأهداف وإرجاع حدث لكل هدف فور اكتماله مع الملخص الجاري
+        
+        يملأ القاموس results (إن مُرر) بنفس صيغة نتيجة comprehensive_scan.
+        """
+        results = results if results is not None else {}
+        # الهدف المكرر يفحص مرة واحدة حتى يطابق العدد الكلي عدد النتائج
+        targets = list(dict.fromkeys(targets))
+        
+        target_types = {self.detect_target_type(t) for t in targets}
+        if not await self.initialize(target_types):
+            raise RuntimeError('فشل تهيئة النظام')
+        
+        scan_id = f"scan_{int(datetime.now().timestamp())}"
+        token = current_scan_id.set(scan_id)
+        try:
+            results.update({
                 'scan_id': scan_id,
                 'start_time': datetime.now().isoformat(),
                 'targets': targets,
                 'results': {}
-            }
+            })
             
-            # معالجة كل هدف
+            # جدولة الأهداف حسب نوعها
+            scheduler = TargetScheduler(self.process_target, controller=self.concurrency)
             for target in targets:
                 if not self.security.validate_target(target):
                     self.logger.warning(f"هدف غير صالح تم تخطيه: {target}")
                     continue
                 
-                target_results = await self.process_target(target)
+                scheduler.add(target, self.detect_target_type(target))
+            
+            total = sum(len(queued) for queued in scheduler.queues.values())
+            summary = ScanSummary()
+            started = time.monotonic()
+            
+            async for target, target_results in scheduler.run(deadline or settings.SCAN_DEADLINE):
                 results['results'][target] = target_results
+                summary.add(target_results)
+                results['summary'] = summary.as_dict()
+                
+                yield {
+                    'scan_id': scan_id,
+                    'target': target,
+                    'result': target_results,
+                    'completed': summary.total_targets,
+                    'total': total,
+                    'elapsed': time.monotonic() - started,
+                    'concurrency': scheduler.current_limit(),
+                    'summary': results['summary']
+                }
+            
+            # الأهداف التي لم تكتمل قبل انتهاء المهلة
+            if scheduler.unfinished:
+                results['unfinished'] = scheduler.unfinished
             
             # إضافة التحليلات النهائية
             results['end_time'] = datetime.now().isoformat()
-            results['summary'] = self.generate_summary(results['results'])
+            results['summary'] = summary.as_dict()
             
-            # حفظ النتائج
-            await self.save_results(results)
-            
-            self.logger.info("✅ اكتمل المسح الشامل بنجاح")
-            return results
-            
-        except Exception as e:
-            self.logger.error(f"❌ فشل المسح الشامل: {e}")
-            return {'error': str(e)}
-        
         finally:
             await self.cleanup()
+            try:
+                current_scan_id.reset(token)
+            except ValueError:
+                # المولد أغلق من سياق آخر (مثل جامع المهملات) فلا يوجد ما يستعاد
+                pass
     
     async def process_target(self, target: str) -> Dict[str, Any]:
         """معالجة هدف فردي"""
+        current_target.set(target)
         target_results = {
             'target': target,
             'type': self.detect_target_type(target),
@@ -118,6 +201,10 @@ class QuantumReplitEngine:
         }
         
         try:
+            # الإجابة من التخزين المحلي عند انقطاع الاتصال
+            if not await self.is_online(target_results['type']):
+                target_results['offline'] = True
+            
             # التحليل حسب نوع الهدف
             if target_results['type'] == 'email':
                 email_analysis = await self.email_analyzer.analyze(target)
@@ -125,7 +212,9 @@ class QuantumReplitEngine:
             
             elif target_results['type'] == 'username':
                 # تحليل اسم المستخدم عبر المنصات
-                platform_analysis = await self.analyze_username_across_platforms(target)
+                platform_analysis = await self.analyze_username_across_platforms(
+                    target, offline=target_results.get('offline', False)
+                )
                 target_results['analysis']['platforms'] = platform_analysis
             
             elif target_results['type'] == 'phone':
@@ -148,20 +237,34 @@ class QuantumReplitEngine:
         
         return target_results
     
+    async def is_online(self, target_type: str) -> bool:
+        """انتظار نتيجة فحص الاتصال الخاص بنوع الهدف إن وجد"""
+        if settings.OFFLINE_MODE:
+            return False
+        
+        check = self.connectivity_checks.get(target_type)
+        if check is None:
+            return True
+        
+        try:
+            return await asyncio.shield(check)
+        except Exception:
+            return False
+    
     def detect_target_type(self, target: str) -> str:
         """كشف نوع الهدف"""
         import re
         
         if re.match(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$', target):
             return 'email'
-        elif re.match(r'^\+?[1-9]\d{1,14}$', target):
+        elif re.match(r'^(?!\d{1,3}(?:\.\d{1,3}){3}$)(?!\d{4}[-./]\d{1,2}[-./]\d{1,2}$)(?!\d{1,2}[-./]\d{1,2}[-./]\d{2,4}$)(?=(?:\D*\d){2,17}\D*$)\+?[\d\s().-]+$', target):
             return 'phone'
         elif re.match(r'^@?[a-zA-Z0-9_]{1,30}$', target):
             return 'username'
         else:
             return 'unknown'
     
-    async def analyze_username_across_platforms(self, username: str) -> Dict[str, Any]:
+    async def analyze_username_across_platforms(self, username: str, offline: bool = False) -> Dict[str, Any]:
         """تحليل اسم المستخدم عبر منصات متعددة"""
         platform_results = {}
         
@@ -175,6 +278,19 @@ class QuantumReplitEngine:
         }
         
         for platform, url in platforms.items():
+            if offline or self.session is None:
+                cached = await self.cache.get(url, allow_stale=True)
+                platform_results[platform] = cached if cached is not None else {
+                    'exists': None,
+                    'offline': True
+                }
+                continue
+            
+            cached = await self.cache.get(url)
+            if cached is not None:
+                platform_results[platform] = cached
+                continue
+            
             try:
                 async with self.session.get(url) as response:
                     if response.status == 200:
@@ -188,6 +304,10 @@ class QuantumReplitEngine:
                             'exists': False,
                             'status': response.status
                         }
+                
+                # تخزين الإجابات النهائية فقط (ليس أخطاء الخادم أو حدود المعدل)
+                if response.status in (200, 404):
+                    await self.cache.set(url, platform_results[platform])
             except Exception as e:
                 platform_results[platform] = {
                     'exists': False,
@@ -196,6 +316,10 @@ class QuantumReplitEngine:
         
         return platform_results
     
+    async def analyze_phone_number(self, phone: str) -> Dict[str, Any]:
+        """تحليل رقم هاتف (بدون اتصال)"""
+        return await self.phone_analyzer.analyze(phone)
+    
     async def extract_contacts(self, target_data: Dict) -> Dict[str, List]:
         """استخراج جهات الاتصال من البيانات"""
         contacts = {
@@ -233,19 +357,10 @@ class QuantumReplitEngine:
     
     def generate_summary(self, results: Dict) -> Dict[str, Any]:
         """توليد ملخص النتائج"""
-        total_targets = len(results)
-        successful_scans = sum(1 for r in results.values() if 'error' not in r)
-        total_contacts = sum(len(r.get('contacts', {}).get('emails', [])) + 
-                           len(r.get('contacts', {}).get('phones', [])) 
-                           for r in results.values() if 'contacts' in r)
-        
-        return {
-            'total_targets': total_targets,
-            'successful_scans': successful_scans,
-            'success_rate': (successful_scans / total_targets * 100) if total_targets > 0 else 0,
-            'total_contacts_found': total_contacts,
-            'scan_quality': 'high' if successful_scans > 0 else 'low'
-        }
+        summary = ScanSummary()
+        for result in results.values():
+            summary.add(result)
+        return summary.as_dict()
     
     async def save_results(self, results: Dict):
         """حفظ النتائج"""
@@ -253,91 +368,100 @@ class QuantumReplitEngine:
             from utils.helpers import DataSaver
             saver = DataSaver()
             
-            # حفظ كـ JSON
-            json_path = await saver.save_json(results, 'scan_results')
-            
-            # حفظ كـ HTML report
-            html_path = await self.generate_html_report(results)
+            # حفظ JSON وتقرير HTML معاً عبر خيط الكاتب
+            json_path, html_path = await asyncio.gather(
+                saver.save_json(results, 'scan_results'),
+                self.generate_html_report(results)
+            )
             
             self.logger.info(f"💾 النتائج محفوظة: {json_path}, {html_path}")
             
+            # إضافة النتائج إلى فهرس البحث خارج حلقة الأحداث
+            if json_path:
+                from core.result_index import ResultIndex
+                await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: ResultIndex().add_results(results, json_path)
+                )
+            
         except Exception as e:
             self.logger.error(f"❌ فشل حفظ النتائج: {e}")
     
     async def generate_html_report(self, results: Dict) -> str:
         """توليد تقرير HTML"""
         try:
-            report_template = """
-            <!DOCTYPE html>
-            <html dir="rtl">
-            <head>
-                <meta charset="UTF-8">
-                <title>تقرير QuantumOSINT</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; direction: rtl; }
-                    .header { background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }
-                    .result { border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; }
-                    .contact { background: #f8f9fa; padding: 10px; margin: 5px 0; border-radius: 3px; }
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>تقرير QuantumOSINT</h1>
-                    <p>تم إنشاء التقرير في: {timestamp}</p>
-                </div>
-                
-                <div class="summary">
-                    <h2>ملخص النتائج</h2>
-                    <p>عدد الأهداف: {total_targets}</p>
-                    <p>نسبة النجاح: {success_rate}%</p>
-                    <p>جهات اتصال مكتشفة: {total_contacts}</p>
-                </div>
-                
-                {results_html}
-            </body>
-            </html>
-            """
-            
-            # توليد HTML للنتائج
-            results_html = ""
-            for target, data in results.get('results', {}).items():
-                results_html += f"""
-                <div class="result">
-                    <h3>الهدف: {target}</h3>
-                    <p>النوع: {data.get('type', 'غير معروف')}</p>
-                    <div class="contacts">
-                        <h4>جهات الاتصال:</h4>
-                        {''.join(f'<div class="contact">📧 {email}</div>' for email in data.get('contacts', {}).get('emails', []))}
-                        {''.join(f'<div class="contact">📞 {phone}</div>' for phone in data.get('contacts', {}).get('phones', []))}
-                    </div>
-                </div>
-                """
-            
-            final_html = report_template.format(
-                timestamp=datetime.now().isoformat(),
-                total_targets=len(results.get('results', {})),
-                success_rate=results.get('summary', {}).get('success_rate', 0),
-                total_contacts=results.get('summary', {}).get('total_contacts_found', 0),
-                results_html=results_html
-            )
-            
-            # حفظ الملف
             reports_dir = self.environment.base_dir / 'reports'
-            reports_dir.mkdir(exist_ok=True)
-            
             report_path = reports_dir / f"report_{int(datetime.now().timestamp())}.html"
-            report_path.write_text(final_html, encoding='utf-8')
             
-            return str(report_path)
+            # التوليد والكتابة في خيط الكاتب
+            return await get_file_writer().write(
+                report_path, lambda f: f.write(self.render_html_report(results))
+            )
             
         except Exception as e:
             self.logger.error(f"❌ فشل توليد تقرير HTML: {e}")
             return ""
     
+    def render_html_report(self, results: Dict) -> str:
+        """بناء محتوى تقرير HTML"""
+        report_template = """
+        <!DOCTYPE html>
+        <html dir="rtl">
+        <head>
+            <meta charset="UTF-8">
+            <title>تقرير QuantumOSINT</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; direction: rtl; }}
+                .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; }}
+                .result {{ border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; }}
+                .contact {{ background: #f8f9fa; padding: 10px; margin: 5px 0; border-radius: 3px; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>تقرير QuantumOSINT</h1>
+                <p>تم إنشاء التقرير في: {timestamp}</p>
+            </div>
+            
+            <div class="summary">
+                <h2>ملخص النتائج</h2>
+                <p>عدد الأهداف: {total_targets}</p>
+                <p>نسبة النجاح: {success_rate}%</p>
+                <p>جهات اتصال مكتشفة: {total_contacts}</p>
+            </div>
+            
+            {results_html}
+        </body>
+        </html>
+        """
+        
+        # توليد HTML للنتائج
+        results_html = ""
+        for target, data in results.get('results', {}).items():
+            results_html += f"""
+            <div class="result">
+                <h3>الهدف: {target}</h3>
+                <p>النوع: {data.get('type', 'غير معروف')}</p>
+                <div class="contacts">
+                    <h4>جهات الاتصال:</h4>
+                    {''.join(f'<div class="contact">📧 {email}</div>' for email in data.get('contacts', {}).get('emails', []))}
+                    {''.join(f'<div class="contact">📞 {phone}</div>' for phone in data.get('contacts', {}).get('phones', []))}
+                </div>
+            </div>
+            """
+        
+        return report_template.format(
+            timestamp=datetime.now().isoformat(),
+            total_targets=len(results.get('results', {})),
+            success_rate=results.get('summary', {}).get('success_rate', 0),
+            total_contacts=results.get('summary', {}).get('total_contacts_found', 0),
+            results_html=results_html
+        )
+    
     async def cleanup(self):
         """تنظيف الموارد"""
         if self.session:
             await self.session.close()
+            self.session = None
         
         # إلغاء أي مهام نشطة
         for task in self.active_tasks:
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+فهرس بحث نصي كامل (SQLite FTS5) فوق نتائج المسح المحفوظة
+"""
+
+import sys
+import json
+import time
+import logging
+import sqlite3
+import argparse
+from pathlib import Path
+from contextlib import closing
+from typing import Dict, Any, List, Optional, Iterator
+
+from config.settings import settings
+
+class ResultIndex:
+    """فهرس معكوس للأهداف وجهات الاتصال وحقول المنصات
+
+    يتتبع الملفات المفهرسة (المسار والحجم ووقت التعديل) حتى تكون الفهرسة
+    تزايدية، ويعيد فهرسة الملف فقط إذا تغير.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = str(db_path or settings.INDEX_DB_PATH)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _create_schema(self):
+        """إنشاء جداول الفهرس"""
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS indexed_files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    records INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_id INTEGER,
+                    scan_id TEXT,
+                    target TEXT NOT NULL,
+                    type TEXT,
+                    scanned_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_records_file ON records (file_id);
+                CREATE INDEX IF NOT EXISTS idx_records_target ON records (target);
+                CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5 (target, contacts, fields);
+            """)
+
+    def ingest_directory(self, directory: Path = None, pattern: str = 'scan_results_*.json') -> int:
+        """فهرسة ملفات التصدير الجديدة أو المعدلة فقط؛ يعيد عدد الملفات المفهرسة"""
+        directory = Path(directory or Path(__file__).parent.parent / 'exports')
+        indexed = 0
+
+        with closing(self._connect()) as conn:
+            known = {
+                path: (size, mtime)
+                for path, size, mtime in conn.execute('SELECT path, size, mtime FROM indexed_files')
+            }
+
+            for path in sorted(directory.glob(pattern)):
+                stat = path.stat()
+                if known.get(str(path)) == (stat.st_size, stat.st_mtime):
+                    continue
+
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        results = json.load(f)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"تعذرت فهرسة {path}: {e}")
+                    continue
+
+                with conn:
+                    self._index_results(conn, results, path, stat.st_size, stat.st_mtime)
+                indexed += 1
+
+        if indexed:
+            self.logger.info(f"🗂️ تمت فهرسة {indexed} ملف نتائج")
+        return indexed
+
+    def add_results(self, results: Dict[str, Any], source_path: str):
+        """فهرسة نتائج مسح جديد فور حفظها"""
+        path = Path(source_path)
+        stat = path.stat()
+        with closing(self._connect()) as conn, conn:
+            self._index_results(conn, results, path, stat.st_size, stat.st_mtime)
+
+    def _index_results(self, conn: sqlite3.Connection, results: Dict[str, Any], path: Path, size: int, mtime: float):
+        """استبدال سجلات الملف بمحتواه الحالي (داخل معاملة المستدعي)"""
+        row = conn.execute('SELECT id FROM indexed_files WHERE path = ?', (str(path),)).fetchone()
+        if row:
+            file_id = row[0]
+            conn.execute('DELETE FROM records_fts WHERE rowid IN (SELECT id FROM records WHERE file_id = ?)', (file_id,))
+            conn.execute('DELETE FROM records WHERE file_id = ?', (file_id,))
+        else:
+            file_id = conn.execute(
+                'INSERT INTO indexed_files (path, size, mtime, records, indexed_at) VALUES (?, ?, ?, 0, ?)',
+                (str(path), size, mtime, time.time())
+            ).lastrowid
+
+        count = 0
+        for target, target_results in results.get('results', {}).items():
+            record_id = conn.execute(
+                'INSERT INTO records (file_id, scan_id, target, type, scanned_at) VALUES (?, ?, ?, ?, ?)',
+                (file_id, results.get('scan_id'), target, target_results.get('type'), results.get('start_time'))
+            ).lastrowid
+
+            contacts = target_results.get('contacts', {})
+            conn.execute(
+                'INSERT INTO records_fts (rowid, target, contacts, fields) VALUES (?, ?, ?, ?)',
+                (
+                    record_id,
+                    target,
+                    ' '.join(contacts.get('emails', []) + contacts.get('phones', [])),
+                    ' '.join(self._flatten(target_results.get('analysis', {})))
+                )
+            )
+            count += 1
+
+        conn.execute(
+            'UPDATE indexed_files SET size = ?, mtime = ?, records = ?, indexed_at = ? WHERE id = ?',
+            (size, mtime, count, time.time(), file_id)
+        )
+
+    def relocate(self, moved: Dict[str, str]):
+        """تحديث مسارات الملفات بعد نقلها (مثل ضغطها في أرشيف)"""
+        if not moved:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                'UPDATE indexed_files SET path = ? WHERE path = ?',
+                [(new_path, old_path) for old_path, new_path in moved.items()]
+            )
+
+    def forget(self, paths: List[str]):
+        """حذف سجلات ملفات حُذفت من القرص، بما فيها الملفات داخل أرشيف محذوف"""
+        if not paths:
+            return
+        with closing(self._connect()) as conn, conn:
+            for path in paths:
+                file_ids = [
+                    row[0] for row in conn.execute(
+                        'SELECT id FROM indexed_files WHERE path = ? OR substr(path, 1, ?) = ?',
+                        (path, len(path) + 1, f"{path}:")
+                    )
+                ]
+                for file_id in file_ids:
+                    conn.execute('DELETE FROM records_fts WHERE rowid IN (SELECT id FROM records WHERE file_id = ?)', (file_id,))
+                    conn.execute('DELETE FROM records WHERE file_id = ?', (file_id,))
+                    conn.execute('DELETE FROM indexed_files WHERE id = ?', (file_id,))
+
+    def _flatten(self, value: Any) -> Iterator[str]:
+        """القيم النصية والرقمية في بيانات التحليل"""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, (dict, list)):
+                    yield from self._flatten(item)
+                elif item not in (None, '', False):
+                    yield f"{key} {item}"
+        elif isinstance(value, list):
+            for item in value:
+                yield from self._flatten(item)
+        elif value not in (None, ''):
+            yield str(value)
+
+    @staticmethod
+    def _build_query(query: str, field: Optional[str] = None) -> str:
+        """تحويل نص المستخدم إلى استعلام FTS5 (كل كلمة عبارة مقتبسة)"""
+        terms = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+        return f"{field} : ({terms})" if field else terms
+
+    def search(self, query: str, field: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """البحث في النتائج المفهرسة مرتبة حسب الصلة
+
+        field: تقييد البحث بعمود (target أو contacts أو fields).
+        """
+        if not query.strip():
+            return []
+        if field not in (None, 'target', 'contacts', 'fields'):
+            raise ValueError(f"حقل بحث غير معروف: {field}")
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT r.scan_id, r.target, r.type, r.scanned_at, f.path,
+                       snippet(records_fts, -1, '[', ']', '…', 12)
+                FROM records_fts
+                JOIN records r ON r.id = records_fts.rowid
+                LEFT JOIN indexed_files f ON f.id = r.file_id
+                WHERE records_fts MATCH ?
+                ORDER BY bm25(records_fts)
+                LIMIT ?
+            """, (self._build_query(query, field), limit)).fetchall()
+
+        return [
+            {
+                'scan_id': scan_id,
+                'target': target,
+                'type': target_type,
+                'scanned_at': scanned_at,
+                'source_file': path,
+                'match': match
+            }
+            for scan_id, target, target_type, scanned_at, path, match in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """حجم الفهرس"""
+        with closing(self._connect()) as conn:
+            files, records = conn.execute('SELECT COUNT(*), COALESCE(SUM(records), 0) FROM indexed_files').fetchone()
+        return {'indexed_files': files, 'indexed_records': records}
+
+def main():
+    """واجهة سطر الأوامر: فهرسة التصديرات والبحث فيها"""
+    parser = argparse.ArgumentParser(description='QuantumOSINT results index')
+    parser.add_argument('--db', default=settings.INDEX_DB_PATH, help='مسار قاعدة بيانات الفهرس')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='فهرسة ملفات scan_results_*.json الجديدة')
+    ingest.add_argument('directory', nargs='?', default=None)
+
+    search = commands.add_parser('search', help='البحث في النتائج المفهرسة')
+    search.add_argument('query')
+    search.add_argument('--field', choices=['target', 'contacts', 'fields'])
+    search.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args()
+    index = ResultIndex(args.db)
+
+    if args.command == 'ingest':
+        print(f"🗂️ ملفات جديدة: {index.ingest_directory(args.directory)} | {index.stats()}")
+    else:
+        index.ingest_directory()
+        for hit in index.search(args.query, args.field, args.limit):
+            print(f"{hit['scanned_at']}  {hit['target']:<30} {hit['type'] or '':<9} {hit['match']}  ({hit['source_file']})")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
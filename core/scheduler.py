@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+جدولة الأهداف بطوابير لكل نوع ومشاركة عادلة موزونة
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque, defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+
+class TargetScheduler:
+    """مجدول أهداف مختلطة الأنواع
+
+    لكل نوع هدف طابور خاص، وتوزع الفتحات المتزامنة بينها بالتناوب الموزون
+    السلس حتى تنتهي الأهداف الرخيصة أولاً دون أن يجوّع نوع كثيف بقية الأنواع.
+    """
+
+    def __init__(self, worker: Callable[[str], Awaitable[Dict[str, Any]]],
+                 concurrency: Optional[int] = None,
+                 weights: Optional[Dict[str, int]] = None,
+                 max_in_flight: Optional[Dict[str, int]] = None,
+                 controller=None):
+        self.logger = logging.getLogger(__name__)
+        self.worker = worker
+        self.concurrency = concurrency or settings.MAX_CONCURRENT_REQUESTS
+        self.weights = weights if weights is not None else settings.SCHEDULER_WEIGHTS
+        self.max_in_flight = max_in_flight if max_in_flight is not None else settings.SCHEDULER_MAX_IN_FLIGHT
+        self.controller = controller
+
+        self.queues = defaultdict(deque)
+        self.in_flight = defaultdict(int)
+        self.unfinished = []
+        self._credit = defaultdict(int)
+
+    def add(self, target: str, target_type: str):
+        """إضافة هدف إلى طابور نوعه"""
+        self.queues[target_type].append(target)
+
+    def current_limit(self) -> int:
+        """الحد الحالي للمهام الجارية (متغير إن وجد متحكم تكيفي)"""
+        if self.controller is not None:
+            return min(self.controller.limit, self.concurrency)
+        return self.concurrency
+
+    def _weight(self, target_type: str) -> int:
+        return max(self.weights.get(target_type, 1), 1)
+
+    def _next(self) -> Optional[Tuple[str, str]]:
+        """اختيار الهدف التالي بالتناوب الموزون السلس"""
+        candidates = [
+            target_type for target_type, pending in self.queues.items()
+            if pending and self.in_flight[target_type] < self.max_in_flight.get(target_type, self.concurrency)
+        ]
+        if not candidates:
+            return None
+
+        total = 0
+        for target_type in candidates:
+            self._credit[target_type] += self._weight(target_type)
+            total += self._weight(target_type)
+
+        chosen = max(candidates, key=lambda target_type: self._credit[target_type])
+        self._credit[chosen] -= total
+        return chosen, self.queues[chosen].popleft()
+
+    async def run(self, deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """تشغيل الأهداف وإرجاع (الهدف، النتيجة) فور اكتمال كل منها
+
+        عند انتهاء المهلة تلغى المهام الجارية وتحفظ الأهداف غير المنجزة في
+        self.unfinished.
+        """
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + deadline if deadline else None
+        pending = {}
+
+        if self.controller is not None:
+            self.controller.start()
+
+        try:
+            while True:
+                # فحص المهلة في كل دورة وليس فقط عند انتظار بلا نتائج، لأن
+                # الأهداف السريعة قد تكتمل باستمرار بعد انقضائها
+                if end_time is not None and loop.time() >= end_time:
+                    self.logger.warning(f"⏰ انتهت مهلة المسح مع {len(pending)} هدف جار")
+                    return
+
+                while len(pending) < self.current_limit():
+                    selected = self._next()
+                    if selected is None:
+                        break
+                    target_type, target = selected
+                    self.in_flight[target_type] += 1
+                    task = asyncio.ensure_future(self.worker(target))
+                    pending[task] = (target_type, target, time.monotonic())
+
+                if not pending:
+                    return
+
+                timeout = None if end_time is None else max(end_time - loop.time(), 0)
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    self.logger.warning(f"⏰ انتهت مهلة المسح مع {len(pending)} هدف جار")
+                    return
+
+                for task in done:
+                    target_type, target, started = pending.pop(task)
+                    self.in_flight[target_type] -= 1
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = {'target': target, 'type': target_type, 'error': str(e)}
+
+                    if self.controller is not None:
+                        self.controller.record(time.monotonic() - started, 'error' in result, target_type, started)
+                    yield target, result
+        finally:
+            if self.controller is not None:
+                self.controller.stop()
+            for task in pending:
+                task.cancel()
+            self.unfinished = [target for _, target, _ in pending.values()]
+            for queued in self.queues.values():
+                self.unfinished.extend(queued)
+                queued.clear()
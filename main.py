@@ -20,13 +20,14 @@ async def main():
     
     # إعداد البيئة
     env = ReplitEnvironment()
+    env.start_maintenance()
     
     # عرض الشعار
     display_welcome_banner()
     
     try:
         # إنشاء وتهيئة المحرك
-        engine = QuantumReplitEngine()
+        engine = QuantumReplitEngine(env)
         
         print("\n🔍 نظام QuantumOSINT جاهز للتشغيل على Replit!")
         print("=" * 50)
@@ -37,7 +38,8 @@ async def main():
             print("1. 🔍 مسح أهداف")
             print("2. 📊 عرض الإحصائيات")
             print("3. ⚙️  إعدادات النظام")
-            print("4. 🚪 خروج")
+            print("4. 🔎 بحث في النتائج السابقة")
+            print("5. 🚪 خروج")
             
             choice = input("\nاختر رقم الأمر: ").strip()
             
@@ -48,6 +50,8 @@ async def main():
             elif choice == "3":
                 show_settings()
             elif choice == "4":
+                await search_history()
+            elif choice == "5":
                 print("👋 مع السلامة!")
                 break
             else:
@@ -56,6 +60,9 @@ async def main():
     except Exception as e:
         print(f"❌ خطأ في النظام: {e}")
         return 1
+    finally:
+        # انتظار انتهاء دورة الصيانة الجارية حتى لا يقطع أرشيف أثناء كتابته
+        env.maintenance.stop()
     
     return 0
 
@@ -72,23 +79,77 @@ async def run_scan(engine):
     
     targets = [t.strip() for t in targets_input.split(',')]
     
+    deadline_input = input("المهلة بالثواني (اتركها فارغة بدون مهلة): ").strip()
+    deadline = float(deadline_input) if deadline_input.replace('.', '', 1).isdigit() else None
+    
     print(f"\n🚀 بدء المسح لـ {len(targets)} هدف...")
     
-    results = await engine.comprehensive_scan(targets)
+    results = await engine.comprehensive_scan(targets, deadline=deadline, on_progress=render_progress)
+    print(file=sys.stderr)
     
     if 'error' in results:
         print(f"❌ فشل المسح: {results['error']}")
     else:
         print(f"✅ اكتمل المسح بنجاح!")
         print(f"📊 النتائج: {results['summary']}")
+        if results.get('unfinished'):
+            print(f"⏰ لم يكتمل قبل المهلة: {', '.join(results['unfinished'])}")
+
+def render_progress(event):
+    """عرض شريط تقدم مع معدل الإنجاز والوقت المتبقي
+
+    يرسم على stderr حتى لا يختلط بسجلات stdout أو بالمخرجات المعاد توجيهها.
+    """
+    completed, total = event['completed'], max(event['total'], 1)
+    width = 30
+    filled = int(width * completed / total)
+    bar = '█' * filled + '░' * (width - filled)
+    
+    rate = completed / event['elapsed'] if event['elapsed'] > 0 else 0
+    eta = (total - completed) / rate if rate > 0 else 0
+    success_rate = event['summary']['success_rate']
+    
+    print(
+        f"\r[{bar}] {completed}/{total} | {rate:.1f} هدف/ث | "
+        f"متبقي ~{eta:.0f}ث | نجاح {success_rate:.0f}% | تزامن {event['concurrency']} | "
+        f"{event['target'][:25]:<25}",
+        end='', file=sys.stderr, flush=True
+    )
 
 async def show_stats(engine):
     """عرض إحصائيات النظام"""
     stats = engine.environment.check_resources()
+    if engine.concurrency is not None:
+        stats.update(engine.concurrency.stats())
+    
     print("\n📈 إحصائيات النظام:")
     for key, value in stats.items():
         print(f"   {key}: {value}")
 
+async def search_history():
+    """البحث في نتائج المسح السابقة"""
+    from core.result_index import ResultIndex
+    
+    query = input("\nالبحث عن: ").strip()
+    if not query:
+        print("❌ لم تدخل نص البحث")
+        return
+    
+    index = ResultIndex()
+    loop = asyncio.get_running_loop()
+    
+    # فهرسة أي تصديرات جديدة ثم البحث
+    await loop.run_in_executor(None, index.ingest_directory)
+    hits = await loop.run_in_executor(None, index.search, query)
+    
+    if not hits:
+        print("🔍 لا توجد نتائج")
+        return
+    
+    print(f"\n🔍 {len(hits)} نتيجة:")
+    for hit in hits:
+        print(f"   {hit['scanned_at']} | {hit['target']} ({hit['type']}) | {hit['match']}")
+
 def show_settings():
     """عرض إعدادات النظام"""
     from config.settings import settings
@@ -96,6 +157,7 @@ def show_settings():
     print(f"   الإصدار: {settings.VERSION}")
     print(f"   بيئة Replit: {settings.IS_REPLIT}")
     print(f"   طلبات متزامنة: {settings.MAX_CONCURRENT_REQUESTS}")
+    print(f"   وضع عدم الاتصال: {settings.OFFLINE_MODE}")
 
 def display_welcome_banner():
     """عرض شعار الترحيب"""
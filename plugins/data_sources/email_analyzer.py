@@ -3,16 +3,23 @@
 محلل البريد الإلكتروني لـ Replit
 """
 
+import asyncio
 import aiohttp
 import dns.resolver
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from config.settings import settings
+from utils.helpers import ResponseCache
+from plugins.data_sources.whois_lookup import WhoisLookup
 
 class EmailIntelligence:
     """محلل ذكي للبريد الإلكتروني"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.whois = WhoisLookup()
+        self.cache = ResponseCache(ttl=settings.CACHE_TTL)
     
     async def analyze(self, email: str) -> Dict[str, Any]:
         """تحليل شامل للبريد الإلكتروني"""
@@ -56,12 +63,7 @@ class EmailIntelligence:
         
         try:
             # فحص سجلات MX
-            try:
-                mx_records = dns.resolver.resolve(domain, 'MX')
-                domain_info['mx_records'] = [str(r.exchange) for r in mx_records]
-                domain_info['has_mx'] = True
-            except:
-                domain_info['has_mx'] = False
+            domain_info.update(await self.get_mx_records(domain))
             
             # معلومات whois أساسية
             domain_info['whois'] = await self.get_basic_whois(domain)
@@ -71,15 +73,34 @@ class EmailIntelligence:
         
         return domain_info
     
-    async def get_basic_whois(self, domain: str) -> Dict[str, str]:
+    async def get_mx_records(self, domain: str) -> Dict[str, Any]:
+        """سجلات MX للنطاق؛ في وضع عدم الاتصال تقرأ من التخزين المؤقت فقط"""
+        cache_key = f"mx:{domain}"
+        
+        if settings.OFFLINE_MODE:
+            cached = await self.cache.get(cache_key, allow_stale=True)
+            return cached if cached is not None else {'has_mx': None, 'offline': True}
+        
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # الاستعلام حاجب، لذا ينفذ خارج حلقة الأحداث
+        loop = asyncio.get_running_loop()
+        try:
+            mx_records = await loop.run_in_executor(None, dns.resolver.resolve, domain, 'MX')
+            result = {'mx_records': [str(r.exchange) for r in mx_records], 'has_mx': True}
+        except dns.exception.Timeout:
+            return {'has_mx': False}
+        except Exception:
+            result = {'has_mx': False}
+        
+        await self.cache.set(cache_key, result)
+        return result
+    
+    async def get_basic_whois(self, domain: str) -> Dict[str, Any]:
         """الحصول على معلومات whois أساسية"""
-        # محاكاة للحصول على معلومات whois
-        return {
-            'domain': domain,
-            'status': 'active',
-            'created': '2020-01-01',  # مثال
-            'registrar': 'Example Registrar'
-        }
+        return await self.whois.lookup(domain)
     
     async def check_breaches(self, email: str) -> Dict[str, Any]:
         """فحص تسريبات البيانات (محاكاة)"""
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+محلل أرقام الهواتف لـ Replit (يعمل بدون اتصال)
+"""
+
+import logging
+import threading
+from array import array
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from config.settings import settings
+from plugins.data_sources.phone_prefixes import (
+    COUNTRY_CODES, COUNTRY_NAMES, SHARED_CODE_PREFIXES, REGION_PREFIXES, NATIONAL_NUMBER_LENGTHS
+)
+
+# محارف فاصلة تحذف قبل التحليل
+_SEPARATORS = str.maketrans('', '', ' -.()/\t')
+
+class PrefixTrie:
+    """شجرة بادئات رقمية مخزنة في مصفوفات متجاورة
+
+    كل عقدة تشغل 10 خانات في children (فهرس العقدة الابنة لكل رقم أو -1)،
+    والبحث عن أطول بادئة يتم بخطوة واحدة لكل رقم.
+    """
+
+    def __init__(self):
+        self.children = array('i', [-1] * 10)
+        self.values = array('i', [-1])
+        self.records = []
+
+    def insert(self, prefix: str, record: Tuple):
+        """إضافة بادئة مع سجلها"""
+        node = 0
+        for digit in prefix:
+            slot = node * 10 + ord(digit) - 48
+            child = self.children[slot]
+            if child == -1:
+                child = len(self.values)
+                self.children.extend([-1] * 10)
+                self.values.append(-1)
+                self.children[slot] = child
+            node = child
+
+        self.values[node] = len(self.records)
+        self.records.append(record)
+
+    def longest_match(self, digits: str) -> Optional[Tuple]:
+        """سجل أطول بادئة مطابقة للرقم"""
+        children, values = self.children, self.values
+        node, found = 0, -1
+        for digit in digits:
+            node = children[node * 10 + ord(digit) - 48]
+            if node == -1:
+                break
+            if values[node] != -1:
+                found = values[node]
+        return self.records[found] if found != -1 else None
+
+_prefix_trie = None
+_prefix_trie_lock = threading.Lock()
+
+def get_prefix_trie() -> PrefixTrie:
+    """بناء جدول البادئات مرة واحدة عند أول استخدام"""
+    global _prefix_trie
+    if _prefix_trie is not None:
+        return _prefix_trie
+
+    with _prefix_trie_lock:
+        if _prefix_trie is None:
+            trie = PrefixTrie()
+            # السجل: (رمز الدولة ISO، رمز الاتصال، المنطقة، نوع الخط)
+            for code, country in COUNTRY_CODES.items():
+                trie.insert(code, (country, code, None, None))
+
+            for prefix, country in SHARED_CODE_PREFIXES.items():
+                calling_code = trie.longest_match(prefix)[1]
+                trie.insert(prefix, (country, calling_code, None, None))
+
+            for prefix, (region, line_type) in REGION_PREFIXES.items():
+                country, calling_code, _, _ = trie.longest_match(prefix)
+                trie.insert(prefix, (country, calling_code, region, line_type))
+
+            _prefix_trie = trie
+
+    return _prefix_trie
+
+class PhoneIntelligence:
+    """محلل أرقام الهواتف: التطبيع إلى E.164 واستنتاج الدولة والمنطقة"""
+
+    def __init__(self, default_country_code: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.default_country_code = default_country_code or settings.DEFAULT_PHONE_COUNTRY_CODE
+
+    async def analyze(self, phone: str) -> Dict[str, Any]:
+        """تحليل رقم هاتف"""
+        result = self.classify(phone)
+
+        if not result['is_valid']:
+            self.logger.warning(f"رقم هاتف غير صالح: {phone}")
+
+        return result
+
+    def normalize(self, phone: str) -> Optional[str]:
+        """تطبيع الرقم إلى أرقام E.164 (بدون +)، أو None إن كان غير صالح"""
+        raw = phone.strip().translate(_SEPARATORS)
+
+        if raw.startswith('+'):
+            digits = raw[1:]
+        elif raw.startswith('00'):
+            digits = raw[2:]
+        elif raw.startswith('0') and self.default_country_code:
+            # رقم محلي: حذف بادئة الاتصال المحلي وإضافة رمز الدولة الافتراضي
+            digits = self.default_country_code + raw[1:]
+        else:
+            digits = raw
+
+        if not digits.isdigit() or not 1 <= len(digits) <= 15 or digits[0] == '0':
+            return None
+        return digits
+
+    def classify(self, phone: str) -> Dict[str, Any]:
+        """تصنيف رقم واحد دون أي اتصال بالشبكة"""
+        result = {
+            'phone': phone,
+            'is_valid': False,
+            'e164': None,
+            'country_code': None,
+            'country': None,
+            'country_name': None,
+            'national_number': None,
+            'region': None,
+            'line_type': None
+        }
+
+        digits = self.normalize(phone)
+        if digits is None:
+            return result
+
+        record = get_prefix_trie().longest_match(digits)
+        if record is None:
+            return result
+
+        country, calling_code, region, line_type = record
+        national_number = digits[len(calling_code):]
+        min_length, max_length = NATIONAL_NUMBER_LENGTHS.get(calling_code, (4, 14))
+
+        result.update({
+            'is_valid': min_length <= len(national_number) <= max_length,
+            'e164': f"+{digits}",
+            'country_code': calling_code,
+            'country': country,
+            'country_name': self.country_name(country),
+            'national_number': national_number,
+            'region': region,
+            'line_type': line_type
+        })
+        return result
+
+    def classify_many(self, phones: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """تصنيف دفعة كبيرة من الأرقام بشكل متدفق"""
+        get_prefix_trie()
+        classify = self.classify
+        for phone in phones:
+            yield classify(phone)
+
+    @staticmethod
+    def country_name(country: Optional[str]) -> Optional[str]:
+        """اسم الدولة من رمز ISO إن كان معروفاً"""
+        return COUNTRY_NAMES.get(country, country)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+جداول بادئات أرقام الهواتف (كل رموز الدول المخصصة في ITU-T E.164 وبعض المناطق)
+"""
+
+# رمز الاتصال الدولي -> رمز الدولة ISO
+COUNTRY_CODES = {
+    '1': 'US', '7': 'RU', '20': 'EG', '27': 'ZA', '30': 'GR', '31': 'NL', '32': 'BE',
+    '33': 'FR', '34': 'ES', '36': 'HU', '39': 'IT', '40': 'RO', '41': 'CH', '43': 'AT',
+    '44': 'GB', '45': 'DK', '46': 'SE', '47': 'NO', '48': 'PL', '49': 'DE', '51': 'PE',
+    '52': 'MX', '53': 'CU', '54': 'AR', '55': 'BR', '56': 'CL', '57': 'CO', '58': 'VE',
+    '60': 'MY', '61': 'AU', '62': 'ID', '63': 'PH', '64': 'NZ', '65': 'SG', '66': 'TH',
+    '81': 'JP', '82': 'KR', '84': 'VN', '86': 'CN', '90': 'TR', '91': 'IN', '92': 'PK',
+    '93': 'AF', '94': 'LK', '95': 'MM', '98': 'IR',
+    '211': 'SS', '212': 'MA', '213': 'DZ', '216': 'TN', '218': 'LY', '220': 'GM',
+    '221': 'SN', '222': 'MR', '223': 'ML', '224': 'GN', '225': 'CI', '226': 'BF',
+    '227': 'NE', '228': 'TG', '229': 'BJ', '230': 'MU', '231': 'LR', '232': 'SL',
+    '233': 'GH', '234': 'NG', '235': 'TD', '236': 'CF', '237': 'CM', '238': 'CV',
+    '239': 'ST', '240': 'GQ', '241': 'GA', '242': 'CG', '243': 'CD', '244': 'AO',
+    '245': 'GW', '246': 'IO', '247': 'AC', '248': 'SC', '249': 'SD', '250': 'RW', '251': 'ET', '252': 'SO',
+    '253': 'DJ', '254': 'KE', '255': 'TZ', '256': 'UG', '257': 'BI', '258': 'MZ',
+    '260': 'ZM', '261': 'MG', '262': 'RE', '263': 'ZW', '264': 'NA', '265': 'MW',
+    '266': 'LS', '267': 'BW', '268': 'SZ', '269': 'KM', '290': 'SH', '291': 'ER',
+    '297': 'AW', '298': 'FO', '299': 'GL',
+    '350': 'GI', '351': 'PT', '352': 'LU', '353': 'IE', '354': 'IS', '355': 'AL',
+    '356': 'MT', '357': 'CY', '358': 'FI', '359': 'BG', '370': 'LT', '371': 'LV',
+    '372': 'EE', '373': 'MD', '374': 'AM', '375': 'BY', '376': 'AD', '377': 'MC',
+    '378': 'SM', '379': 'VA', '380': 'UA', '381': 'RS', '382': 'ME', '383': 'XK', '385': 'HR',
+    '386': 'SI', '387': 'BA', '389': 'MK', '420': 'CZ', '421': 'SK', '423': 'LI',
+    '500': 'FK', '501': 'BZ', '502': 'GT', '503': 'SV', '504': 'HN', '505': 'NI',
+    '506': 'CR', '507': 'PA', '508': 'PM', '509': 'HT', '590': 'GP', '591': 'BO', '592': 'GY',
+    '593': 'EC', '594': 'GF', '595': 'PY', '596': 'MQ', '597': 'SR', '598': 'UY', '599': 'CW',
+    '670': 'TL', '672': 'NF', '673': 'BN', '674': 'NR', '675': 'PG', '676': 'TO',
+    '677': 'SB', '678': 'VU', '679': 'FJ', '680': 'PW', '681': 'WF', '682': 'CK',
+    '683': 'NU', '685': 'WS', '686': 'KI', '687': 'NC', '688': 'TV', '689': 'PF',
+    '690': 'TK', '691': 'FM', '692': 'MH',
+    '850': 'KP', '852': 'HK', '853': 'MO', '855': 'KH', '856': 'LA', '880': 'BD',
+    '886': 'TW', '960': 'MV', '961': 'LB', '962': 'JO', '963': 'SY', '964': 'IQ',
+    '965': 'KW', '966': 'SA', '967': 'YE', '968': 'OM', '970': 'PS', '971': 'AE',
+    '972': 'IL', '973': 'BH', '974': 'QA', '975': 'BT', '976': 'MN', '977': 'NP',
+    '992': 'TJ', '993': 'TM', '994': 'AZ', '995': 'GE', '996': 'KG', '998': 'UZ',
+    # رموز غير جغرافية (هاتف مجاني دولي، أقمار صناعية، شبكات دولية)
+    **{code: '001' for code in ('800', '808', '870', '878', '881', '882', '883', '888', '979')}
+}
+
+# بادئات تتشارك رمز دولة مع دول أخرى (خطة ترقيم أمريكا الشمالية وكازاخستان وغيرها)
+SHARED_CODE_PREFIXES = {
+    '76': 'KZ', '77': 'KZ',
+    '3906698': 'VA', '35818': 'AX', '4779': 'SJ', '5997': 'BQ', '262269': 'YT', '262639': 'YT',
+    '441481': 'GG', '441534': 'JE', '441624': 'IM', '6189162': 'CC', '6189164': 'CX',
+    '1242': 'BS', '1246': 'BB', '1264': 'AI', '1268': 'AG', '1284': 'VG', '1340': 'VI',
+    '1345': 'KY', '1441': 'BM', '1473': 'GD', '1649': 'TC', '1658': 'JM', '1664': 'MS',
+    '1670': 'MP', '1671': 'GU', '1684': 'AS', '1721': 'SX', '1758': 'LC', '1767': 'DM',
+    '1784': 'VC', '1787': 'PR', '1809': 'DO', '1829': 'DO', '1849': 'DO', '1868': 'TT',
+    '1869': 'KN', '1876': 'JM', '1939': 'PR',
+    **{f'1{area}': 'CA' for area in (
+        '204', '226', '236', '249', '250', '263', '289', '306', '343', '354', '365', '367',
+        '382', '403', '416', '418', '428', '431', '437', '438', '450', '468', '474', '506',
+        '514', '519', '548', '579', '581', '584', '587', '604', '613', '639', '647', '672',
+        '683', '705', '709', '742', '753', '778', '780', '782', '807', '819', '825', '867',
+        '873', '879', '902', '905'
+    )}
+}
+
+# البادئة الكاملة (رمز الدولة + البادئة الوطنية) -> (المنطقة، نوع الخط)
+REGION_PREFIXES = {
+    # السعودية
+    '9665': (None, 'mobile'),
+    '96611': ('Riyadh', 'landline'),
+    '96612': ('Makkah / Jeddah', 'landline'),
+    '96613': ('Eastern Province', 'landline'),
+    '96614': ('Madinah / Northern', 'landline'),
+    '96616': ('Qassim / Hail', 'landline'),
+    '96617': ('Southern', 'landline'),
+    # اليمن
+    '9677': (None, 'mobile'),
+    '9671': ("Sana'a", 'landline'),
+    '9672': ('Aden', 'landline'),
+    '9673': ('Hodeidah', 'landline'),
+    '9674': ('Taiz', 'landline'),
+    # مصر
+    '2010': (None, 'mobile'),
+    '2011': (None, 'mobile'),
+    '2012': (None, 'mobile'),
+    '2015': (None, 'mobile'),
+    '202': ('Cairo / Giza', 'landline'),
+    '203': ('Alexandria', 'landline'),
+    # المملكة المتحدة
+    '447': (None, 'mobile'),
+    '4420': ('London', 'landline'),
+    '44121': ('Birmingham', 'landline'),
+    '44131': ('Edinburgh', 'landline'),
+    '44141': ('Glasgow', 'landline'),
+    '44161': ('Manchester', 'landline'),
+    # الولايات المتحدة
+    '1202': ('Washington, DC', None),
+    '1206': ('Seattle, WA', None),
+    '1212': ('New York, NY', None),
+    '1213': ('Los Angeles, CA', None),
+    '1305': ('Miami, FL', None),
+    '1312': ('Chicago, IL', None),
+    '1415': ('San Francisco, CA', None),
+    '1617': ('Boston, MA', None),
+    '1713': ('Houston, TX', None)
+}
+
+# رمز الاتصال -> (أقل، أكثر) عدد أرقام الرقم الوطني؛ الرموز غير المدرجة تقبل 4-14
+NATIONAL_NUMBER_LENGTHS = {
+    '1': (10, 10), '7': (10, 10), '20': (8, 10), '33': (9, 9), '34': (9, 9), '44': (9, 10),
+    '52': (10, 10), '55': (10, 11), '61': (9, 9), '81': (9, 10), '90': (10, 10), '91': (10, 10),
+    '92': (9, 10), '212': (9, 9), '213': (8, 9), '216': (8, 8), '218': (9, 9), '249': (9, 9),
+    '961': (7, 8), '962': (8, 9), '963': (8, 9), '964': (8, 10), '965': (8, 8), '966': (8, 9),
+    '967': (7, 9), '968': (8, 8), '970': (9, 9), '971': (8, 9), '973': (8, 8), '974': (8, 8)
+}
+
+COUNTRY_NAMES = {
+    'US': 'United States', 'CA': 'Canada', 'RU': 'Russia', 'KZ': 'Kazakhstan', 'EG': 'Egypt',
+    'GB': 'United Kingdom', 'SA': 'Saudi Arabia', 'YE': 'Yemen', 'AE': 'United Arab Emirates',
+    'OM': 'Oman', 'QA': 'Qatar', 'KW': 'Kuwait', 'BH': 'Bahrain', 'JO': 'Jordan', 'LB': 'Lebanon',
+    'SY': 'Syria', 'IQ': 'Iraq', 'PS': 'Palestine', 'MA': 'Morocco', 'DZ': 'Algeria',
+    'TN': 'Tunisia', 'LY': 'Libya', 'SD': 'Sudan', 'TR': 'Turkey', 'IR': 'Iran', 'FR': 'France',
+    'DE': 'Germany', 'IT': 'Italy', 'ES': 'Spain', 'IN': 'India', 'PK': 'Pakistan', 'CN': 'China',
+    'JP': 'Japan', 'BR': 'Brazil', 'MX': 'Mexico', 'AU': 'Australia',
+    '001': 'International (non-geographic)'
+}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+استعلامات WHOIS/RDAP مع تخزين دائم وتحديد تزامن لكل سجل
+"""
+
+import csv
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+from pathlib import Path
+from contextlib import closing
+from collections import defaultdict
+from typing import Dict, Any, Optional
+
+import aiohttp
+
+from config.settings import settings
+
+try:
+    import whois as python_whois
+except ImportError:
+    python_whois = None
+
+class WhoisLookup:
+    """طبقة استعلام WHOIS/RDAP
+
+    ترتيب المصادر: التخزين الدائم (بما فيه التفريغات المستوردة) ثم RDAP ثم
+    python-whois، ثم النسخة المخزنة المنتهية إن فشل كل شيء. في وضع عدم
+    الاتصال يستخدم التخزين فقط.
+    """
+
+    def __init__(self, db_path: str = None, rdap_url: str = None, ttl: float = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = str(db_path or settings.WHOIS_DB_PATH)
+        self.rdap_url = (rdap_url or settings.RDAP_BASE_URL).rstrip('/')
+        self.ttl = ttl if ttl is not None else settings.WHOIS_CACHE_TTL
+        self.negative_ttl = min(self.ttl, settings.WHOIS_NEGATIVE_CACHE_TTL)
+
+        self._registry_limits = defaultdict(lambda: asyncio.Semaphore(settings.WHOIS_REGISTRY_CONCURRENCY))
+        self._inflight = {}
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def _create_schema(self):
+        """إنشاء جدول التخزين"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS whois_records (
+                    domain TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+
+    def _load(self, domain: str) -> Optional[tuple]:
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                'SELECT data, fetched_at FROM whois_records WHERE domain = ?', (domain,)
+            ).fetchone()
+
+    def _store(self, records: list):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO whois_records (domain, data, source, fetched_at) VALUES (?, ?, ?, ?)',
+                [(r['domain'], json.dumps(r, ensure_ascii=False, default=str), r['source'], time.time()) for r in records]
+            )
+
+    async def lookup(self, domain: str) -> Dict[str, Any]:
+        """معلومات تسجيل النطاق؛ الطلبات المتزامنة لنفس النطاق تشترك في استعلام واحد"""
+        domain = domain.lower().rstrip('.')
+
+        task = self._inflight.get(domain)
+        if task is None:
+            task = asyncio.ensure_future(self._lookup(domain))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda _: self._inflight.pop(domain, None))
+
+        return await asyncio.shield(task)
+
+    async def _lookup(self, domain: str) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self._load, domain)
+        cached_record = json.loads(cached[0]) if cached else None
+
+        if cached and (settings.OFFLINE_MODE or time.time() - cached[1] < self._ttl_for(cached_record)):
+            return cached_record
+
+        if settings.OFFLINE_MODE:
+            return {'domain': domain, 'status': 'unknown', 'source': 'offline'}
+
+        tld = domain.rsplit('.', 1)[-1]
+        async with self._registry_limits[tld]:
+            record = await self._fetch_rdap(domain)
+            if record is None and python_whois is not None:
+                record = await loop.run_in_executor(None, self._fetch_whois, domain)
+
+        if record is not None:
+            await loop.run_in_executor(None, self._store, [record])
+            return record
+
+        # فشلت كل المصادر: إعادة النسخة القديمة إن وجدت
+        if cached:
+            return cached_record
+        return {'domain': domain, 'status': 'unknown', 'source': 'none'}
+
+    def _ttl_for(self, record: Dict[str, Any]) -> float:
+        """مدة صلاحية السجل المخزن؛ النتائج السلبية تعاد بعد مدة أقصر"""
+        return self.negative_ttl if record.get('status') == 'not_registered' else self.ttl
+
+    async def _fetch_rdap(self, domain: str) -> Optional[Dict[str, Any]]:
+        """استعلام RDAP"""
+        try:
+            timeout = aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(f"{self.rdap_url}/domain/{domain}") as response:
+                    if response.status == 404:
+                        # rdap.org يعيد 404 مباشرة إذا لم يعرف خادم RDAP للامتداد؛ الإجابة
+                        # القاطعة تأتي من خادم السجل (بعد التحويل أو بصيغة rdap+json)
+                        if response.history or response.content_type == 'application/rdap+json':
+                            return {'domain': domain, 'status': 'not_registered', 'source': 'rdap'}
+                        return None
+                    if response.status != 200:
+                        return None
+                    data = await response.json(content_type=None)
+        except Exception as e:
+            self.logger.warning(f"استعلام RDAP فشل لـ {domain}: {e}")
+            return None
+
+        return self.parse_rdap(domain, data)
+
+    def _fetch_whois(self, domain: str) -> Optional[Dict[str, Any]]:
+        """استعلام whois التقليدي (يعمل في خيط منفصل)"""
+        try:
+            data = python_whois.whois(domain)
+        except Exception as e:
+            self.logger.warning(f"استعلام whois فشل لـ {domain}: {e}")
+            return None
+
+        def first(value):
+            return value[0] if isinstance(value, list) and value else value
+
+        return {
+            'domain': domain,
+            'status': 'active' if data.get('domain_name') else 'not_registered',
+            'created': str(first(data.get('creation_date')) or ''),
+            'expires': str(first(data.get('expiration_date')) or ''),
+            'registrar': data.get('registrar') or '',
+            'nameservers': sorted({ns.lower() for ns in (data.get('name_servers') or [])}),
+            'source': 'whois'
+        }
+
+    @staticmethod
+    def parse_rdap(domain: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """تحويل استجابة RDAP إلى الصيغة الموحدة"""
+        events = {e.get('eventAction'): e.get('eventDate', '') for e in data.get('events', [])}
+
+        registrar = ''
+        for entity in data.get('entities', []):
+            if 'registrar' in entity.get('roles', []):
+                for field in (entity.get('vcardArray') or [None, []])[1]:
+                    if field and field[0] == 'fn':
+                        registrar = field[3]
+                        break
+
+        statuses = data.get('status', [])
+        return {
+            'domain': domain,
+            'status': 'active' if statuses and 'inactive' not in statuses else ', '.join(statuses) or 'unknown',
+            'created': events.get('registration', ''),
+            'expires': events.get('expiration', ''),
+            'registrar': registrar,
+            'nameservers': sorted(ns.get('ldhName', '').lower() for ns in data.get('nameservers', [])),
+            'source': 'rdap'
+        }
+
+    def import_dump(self, path: str, batch_size: int = 10000) -> int:
+        """استيراد تفريغ تسجيلات (CSV أو JSON Lines) كمصدر بدون اتصال
+
+        الحقول المتوقعة: domain، وبشكل اختياري registrar وcreated وexpires وstatus.
+        """
+        path = Path(path)
+        imported = 0
+        batch = []
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = csv.DictReader(f) if path.suffix == '.csv' else (json.loads(line) for line in f if line.strip())
+            for row in rows:
+                if not row.get('domain'):
+                    continue
+                batch.append({
+                    'domain': row['domain'].lower().rstrip('.'),
+                    'status': row.get('status') or 'active',
+                    'created': row.get('created', ''),
+                    'expires': row.get('expires', ''),
+                    'registrar': row.get('registrar', ''),
+                    'source': 'dump'
+                })
+                if len(batch) >= batch_size:
+                    self._store(batch)
+                    imported += len(batch)
+                    batch = []
+
+        if batch:
+            self._store(batch)
+            imported += len(batch)
+
+        self.logger.info(f"📥 تم استيراد {imported} سجل whois من {path}")
+        return imported
+
+def main():
+    """استيراد تفريغات التسجيل من سطر الأوامر"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='QuantumOSINT whois dump importer')
+    parser.add_argument('dumps', nargs='+', help='ملفات CSV أو JSON Lines')
+    parser.add_argument('--db', default=settings.WHOIS_DB_PATH, help='مسار قاعدة بيانات whois')
+    args = parser.parse_args()
+
+    lookup = WhoisLookup(db_path=args.db)
+    for dump in args.dumps:
+        print(f"📥 {dump}: {lookup.import_dump(dump)} سجل")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+اختبارات المتحكم التكيفي في التزامن
+"""
+
+import time
+import random
+
+import pytest
+
+from config.settings import settings
+from core.concurrency import AdaptiveConcurrencyController
+
+@pytest.fixture(autouse=True)
+def _fast_decisions(monkeypatch):
+    monkeypatch.setattr(settings, 'ADAPTIVE_DECISION_INTERVAL', 0)
+
+def _run_windows(controller, latency_for_limit, windows):
+    """محاكاة نوافذ متتالية زمن الاستجابة فيها دالة في الحد الحالي"""
+    limits = []
+    for _ in range(windows):
+        latency = latency_for_limit(controller.limit)
+        for _ in range(controller.limit):
+            controller.record(latency, False, 'email', time.monotonic())
+        limits.append(controller.limit)
+    return limits
+
+def test_gradual_latency_growth_backs_off():
+    """الازدحام الذي يسببه رفع الحد تدريجياً يؤدي إلى التخفيض"""
+    controller = AdaptiveConcurrencyController(max_limit=60, initial=4)
+
+    # الخدمة تحتمل 4 طلبات متزامنة ثم يزيد زمنها خطياً مع كل طلب إضافي
+    limits = _run_windows(controller, lambda limit: 0.02 * max(limit - 3, 1), 200)
+
+    assert controller.decreases > 0
+    assert max(limits) < 20
+
+def test_jitter_and_outliers_do_not_back_off():
+    """التذبذب الطبيعي والقيم الشاذة المنفردة لا تخفض الحد"""
+    random.seed(1)
+    controller = AdaptiveConcurrencyController(max_limit=20, initial=4)
+
+    for i in range(2000):
+        latency = 1.5 if i % 37 == 0 else 0.005 + random.random() * 0.01
+        controller.record(latency, False, 'email', time.monotonic())
+
+    assert controller.decreases == 0
+    assert controller.limit == 20
+
+def test_sudden_latency_jump_backs_off():
+    """ارتفاع مفاجئ ومستمر في زمن الاستجابة يخفض الحد"""
+    controller = AdaptiveConcurrencyController(max_limit=20, initial=10)
+    _run_windows(controller, lambda limit: 0.02, 5)
+
+    _run_windows(controller, lambda limit: 0.5, 1)
+
+    assert controller.decreases == 1
+    assert controller.limit < 10
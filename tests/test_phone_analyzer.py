@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+اختبارات محلل أرقام الهواتف وجدول البادئات
+"""
+
+import pytest
+
+from plugins.data_sources.phone_analyzer import PhoneIntelligence, PrefixTrie, get_prefix_trie
+
+def test_trie_longest_match():
+    trie = PrefixTrie()
+    trie.insert('1', ('US', '1', None, None))
+    trie.insert('1242', ('BS', '1', None, None))
+
+    assert trie.longest_match('12425551234')[0] == 'BS'
+    assert trie.longest_match('12025550123')[0] == 'US'
+    assert trie.longest_match('9') is None
+
+def test_prefix_table_shared_codes_and_regions():
+    trie = get_prefix_trie()
+
+    assert trie.longest_match('77012345678')[:2] == ('KZ', '7')
+    assert trie.longest_match('441534123456')[:2] == ('JE', '44')
+    assert trie.longest_match('966112345678') == ('SA', '966', 'Riyadh', 'landline')
+    assert trie.longest_match('59971234567')[:2] == ('BQ', '599')
+
+@pytest.mark.parametrize('phone, expected', [
+    ('+966 50 123 4567', '966501234567'),
+    ('00966501234567', '966501234567'),
+    ('0501234567', '966501234567'),
+    ('+1 (202) 555-0123', '12025550123'),
+    ('+0123', None),
+    ('phone', None),
+    ('+1234567890123456', None)
+])
+def test_normalize(phone, expected):
+    assert PhoneIntelligence(default_country_code='966').normalize(phone) == expected
+
+def test_normalize_local_number_without_default_country():
+    assert PhoneIntelligence(default_country_code='').normalize('0501234567') is None
+
+def test_classify_valid_numbers():
+    analyzer = PhoneIntelligence()
+
+    saudi = analyzer.classify('+966501234567')
+    assert saudi['is_valid'] and saudi['country'] == 'SA' and saudi['line_type'] == 'mobile'
+
+    us = analyzer.classify('+12025550123')
+    assert us['is_valid'] and us['country'] == 'US' and us['region'] == 'Washington, DC'
+
+@pytest.mark.parametrize('phone', ['2024-01-01', '192.168.1.1', '+1202555012', '+120255501234'])
+def test_classify_rejects_wrong_national_length(phone):
+    assert not PhoneIntelligence().classify(phone)['is_valid']
+
+def test_target_validation_rejects_dates_and_ips():
+    pytest.importorskip('aiohttp')
+    from utils.replit_helper import ReplitSecurity
+
+    for target in ('0501234567', '+1 (202) 555-0123', '00966501234567'):
+        assert ReplitSecurity.validate_target(target)
+    for target in ('2024-01-01', '01/02/2024', '192.168.1.1'):
+        assert not ReplitSecurity.validate_target(target)
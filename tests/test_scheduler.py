@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+اختبارات مجدول الأهداف
+"""
+
+import time
+import asyncio
+
+from core.scheduler import TargetScheduler
+
+async def _fast_worker(target):
+    await asyncio.sleep(0.01)
+    return {'target': target}
+
+async def _busy_worker(target):
+    # يكتمل فور تشغيله فتجد asyncio.wait دائماً مهمة منتهية
+    time.sleep(0.002)
+    return {'target': target}
+
+async def _collect(scheduler, deadline=None):
+    return [target async for target, _ in scheduler.run(deadline)]
+
+def test_deadline_stops_while_tasks_keep_completing():
+    """المهلة تنهي المسح حتى لو كانت الأهداف السريعة تكتمل باستمرار"""
+    scheduler = TargetScheduler(_busy_worker, concurrency=2, max_in_flight={})
+    for i in range(500):
+        scheduler.add(f"user{i}", 'username')
+
+    done = asyncio.run(_collect(scheduler, deadline=0.1))
+
+    assert 0 < len(done) < 500
+    assert scheduler.unfinished
+    assert len(done) + len(scheduler.unfinished) == 500
+
+def test_weighted_share_between_types():
+    """الأنواع ذات الوزن الأعلى تحصل على فتحات أكثر دون تجويع البقية"""
+    scheduler = TargetScheduler(_fast_worker, concurrency=1, weights={'email': 3, 'username': 1}, max_in_flight={})
+    for i in range(6):
+        scheduler.add(f"u{i}", 'username')
+        scheduler.add(f"e{i}@example.com", 'email')
+
+    done = asyncio.run(_collect(scheduler))
+
+    assert [t.startswith('u') for t in done[:4]].count(True) == 1
+    assert len(done) == 12 and not scheduler.unfinished
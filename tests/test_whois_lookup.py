@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+اختبارات استعلام WHOIS/RDAP مقابل خادم RDAP محلي
+"""
+
+import json
+import time
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from config.settings import settings
+from plugins.data_sources import whois_lookup
+from plugins.data_sources.whois_lookup import WhoisLookup
+
+RDAP_RECORD = {
+    'status': ['active'],
+    'events': [{'eventAction': 'registration', 'eventDate': '2001-02-03T00:00:00Z'}],
+    'nameservers': [{'ldhName': 'NS1.EXAMPLE.NET'}]
+}
+
+def _rdap_app() -> web.Application:
+    """بديل محلي لـ rdap.org: تحويل إلى خادم السجل أو 404 للامتداد المجهول"""
+    async def bootstrap(request):
+        domain = request.match_info['domain']
+        if domain.endswith('.unknowntld'):
+            return web.Response(status=404, text='no RDAP server for this TLD')
+        if domain.endswith('.broken'):
+            return web.Response(status=500)
+        raise web.HTTPFound(f"/registry/domain/{domain}")
+
+    async def registry(request):
+        domain = request.match_info['domain']
+        if domain.startswith('missing'):
+            return web.json_response({'errorCode': 404}, status=404, content_type='application/rdap+json')
+        return web.json_response(dict(RDAP_RECORD, ldhName=domain), content_type='application/rdap+json')
+
+    app = web.Application()
+    app.router.add_get('/domain/{domain}', bootstrap)
+    app.router.add_get('/registry/domain/{domain}', registry)
+    return app
+
+@pytest.fixture(autouse=True)
+def _online(monkeypatch):
+    monkeypatch.setattr(settings, 'OFFLINE_MODE', False)
+    monkeypatch.setattr(whois_lookup, 'python_whois', None)
+
+def _lookup(tmp_path, *domains, prepare=None):
+    """تشغيل الخادم المحلي واستعلام النطاقات بالترتيب"""
+    async def run():
+        server = TestServer(_rdap_app())
+        await server.start_server()
+        try:
+            lookup = WhoisLookup(db_path=tmp_path / 'whois.db', rdap_url=str(server.make_url('')))
+            if prepare:
+                prepare(lookup)
+            return lookup, [await lookup.lookup(domain) for domain in domains]
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+def test_registered_domain(tmp_path):
+    lookup, (record,) = _lookup(tmp_path, 'example.com')
+
+    assert record['status'] == 'active'
+    assert record['created'] == '2001-02-03T00:00:00Z'
+    assert record['nameservers'] == ['ns1.example.net']
+    assert lookup._load('example.com') is not None
+
+def test_registry_404_is_not_registered_with_short_ttl(tmp_path):
+    lookup, (record,) = _lookup(tmp_path, 'missing.com')
+
+    assert record == {'domain': 'missing.com', 'status': 'not_registered', 'source': 'rdap'}
+    assert lookup._ttl_for(record) == lookup.negative_ttl < lookup.ttl
+
+def test_bootstrap_404_is_inconclusive_and_not_cached(tmp_path):
+    lookup, (record,) = _lookup(tmp_path, 'registered.unknowntld')
+
+    assert record['status'] == 'unknown'
+    assert lookup._load('registered.unknowntld') is None
+
+def test_stale_cache_used_when_rdap_fails(tmp_path):
+    stale = {'domain': 'old.broken', 'status': 'active', 'registrar': 'Old Registrar', 'source': 'rdap'}
+
+    def seed(lookup):
+        with lookup._connect() as conn:
+            conn.execute(
+                'INSERT INTO whois_records (domain, data, source, fetched_at) VALUES (?, ?, ?, ?)',
+                ('old.broken', json.dumps(stale), 'rdap', time.time() - lookup.ttl - 1)
+            )
+
+    _, (record,) = _lookup(tmp_path, 'old.broken', prepare=seed)
+
+    assert record == stale
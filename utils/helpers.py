@@ -3,12 +3,115 @@
 أدوات مساعدة إضافية
 """
 
+import os
 import json
 import csv
+import time
+import queue
+import asyncio
+import hashlib
 import logging
+import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, TextIO
+
+class BackgroundFileWriter:
+    """كاتب ملفات في خيط مستقل حتى لا تحجب الكتابة حلقة الأحداث"""
+    
+    def __init__(self, max_queue: int = 64, batch_size: int = 16):
+        self.logger = logging.getLogger(__name__)
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        # صلاحيات open() العادية؛ mkstemp ينشئ الملفات بـ 0600
+        umask = os.umask(0)
+        os.umask(umask)
+        self.file_mode = 0o666 & ~umask
+        self.thread = threading.Thread(target=self._run, name='quantum-file-writer', daemon=True)
+        self.thread.start()
+    
+    async def write(self, path: Path, render: Callable[[TextIO], None], newline: Optional[str] = None) -> str:
+        """جدولة كتابة ملف؛ التسلسل والكتابة يتمان في خيط الكاتب"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        job = (Path(path), render, newline, loop, future)
+        
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            # الطابور ممتلئ: الانتظار خارج حلقة الأحداث
+            await loop.run_in_executor(None, self.queue.put, job)
+        
+        return await future
+    
+    def close(self):
+        """إيقاف الخيط بعد إنهاء الكتابات المعلقة"""
+        self.queue.put(None)
+        self.thread.join()
+    
+    def _run(self):
+        """حلقة الكاتب: سحب دفعات من الطابور وكتابتها"""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for job in batch:
+                if job is None:
+                    return
+                self._write_job(job)
+    
+    def _write_job(self, job):
+        """كتابة ذرية عبر ملف مؤقت ثم إعادة تسمية"""
+        path, render, newline, loop, future = job
+        result, error = None, None
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+                    render(f)
+                os.chmod(tmp_path, self.file_mode)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            result = str(path)
+        except Exception as e:
+            error = e
+        
+        try:
+            loop.call_soon_threadsafe(self._resolve, future, result, error)
+        except RuntimeError:
+            # حلقة الأحداث أغلقت قبل اكتمال الكتابة
+            pass
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Optional[str], error: Optional[Exception]):
+        """تسليم نتيجة الكتابة إلى حلقة الأحداث"""
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+_file_writer = None
+_file_writer_lock = threading.Lock()
+
+def get_file_writer() -> BackgroundFileWriter:
+    """الكاتب المشترك لكل عمليات الحفظ"""
+    global _file_writer
+    with _file_writer_lock:
+        if _file_writer is None:
+            _file_writer = BackgroundFileWriter()
+        return _file_writer
 
 class DataSaver:
     """حفظ البيانات بأنواع مختلفة"""
@@ -16,18 +119,19 @@ class DataSaver:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.base_dir = Path(__file__).parent.parent
+        self.writer = get_file_writer()
     
     async def save_json(self, data: Dict, filename: str) -> str:
         """حفظ البيانات كـ JSON"""
         try:
             exports_dir = self.base_dir / 'exports'
-            exports_dir.mkdir(exist_ok=True)
-            
             file_path = exports_dir / f"{filename}_{int(datetime.now().timestamp())}.json"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
+            def render(f):
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
+            await self.writer.write(file_path, render)
+            
             self.logger.info(f"💾 تم حفظ JSON: {file_path}")
             return str(file_path)
             
@@ -42,18 +146,18 @@ class DataSaver:
                 return ""
             
             exports_dir = self.base_dir / 'exports'
-            exports_dir.mkdir(exist_ok=True)
-            
             file_path = exports_dir / f"{filename}_{int(datetime.now().timestamp())}.csv"
             
             # استخراج العناوين
             fieldnames = data[0].keys()
             
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            def render(f):
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 writer.writerows(data)
             
+            await self.writer.write(file_path, render, newline='')
+            
             self.logger.info(f"💾 تم حفظ CSV: {file_path}")
             return str(file_path)
             
@@ -61,6 +165,82 @@ class DataSaver:
             self.logger.error(f"❌ فشل حفظ CSV: {e}")
             return ""
 
+class ResponseCache:
+    """تخزين مؤقت محلي لاستجابات المنصات"""
+    
+    def __init__(self, ttl: float = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = Path(__file__).parent.parent
+        self.cache_dir = self.base_dir / 'cache'
+        self.ttl = ttl
+    
+    def _path(self, key: str) -> Path:
+        """مسار ملف المفتاح داخل مجلد التخزين المؤقت"""
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    async def get(self, key: str, allow_stale: bool = False) -> Any:
+        """قراءة قيمة مخزنة، أو None إن لم توجد أو انتهت صلاحيتها"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, key, allow_stale)
+    
+    def _read(self, key: str, allow_stale: bool) -> Any:
+        """قراءة المدخل من القرص (تعمل خارج حلقة الأحداث)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not allow_stale and self.ttl is not None:
+            if time.time() - entry.get('stored_at', 0) > self.ttl:
+                return None
+        
+        # تحديث وقت التعديل ليعكس آخر استخدام (إخلاء LRU في صيانة التخزين)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        return entry.get('value')
+    
+    async def set(self, key: str, value: Any):
+        """تخزين قيمة تحت مفتاح عبر خيط الكاتب"""
+        entry = {'key': key, 'stored_at': time.time(), 'value': value}
+        try:
+            await get_file_writer().write(
+                self._path(key), lambda f: json.dump(entry, f, ensure_ascii=False)
+            )
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"فشل التخزين المؤقت لـ {key}: {e}")
+
+class ScanSummary:
+    """ملخص تراكمي للمسح يحدّث بتكلفة ثابتة لكل نتيجة"""
+    
+    def __init__(self):
+        self.total_targets = 0
+        self.successful_scans = 0
+        self.total_contacts = 0
+    
+    def add(self, result: Dict[str, Any]):
+        """إضافة نتيجة هدف إلى العدادات"""
+        self.total_targets += 1
+        if 'error' not in result:
+            self.successful_scans += 1
+        contacts = result.get('contacts', {})
+        self.total_contacts += len(contacts.get('emails', [])) + len(contacts.get('phones', []))
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """الملخص بنفس صيغة generate_summary"""
+        return {
+            'total_targets': self.total_targets,
+            'successful_scans': self.successful_scans,
+            'success_rate': (self.successful_scans / self.total_targets * 100) if self.total_targets > 0 else 0,
+            'total_contacts_found': self.total_contacts,
+            'scan_quality': 'high' if self.successful_scans > 0 else 'low'
+        }
+
 class PerformanceMonitor:
     """مراقب أداء النظام"""
     
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+نظام تسجيل غير حاجب عبر QueueHandler/QueueListener
+"""
+
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+import logging.handlers
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+from config.settings import settings
+
+# سياق المسح الحالي، يضاف تلقائياً إلى كل سجل
+current_scan_id = contextvars.ContextVar('current_scan_id', default=None)
+current_target = contextvars.ContextVar('current_target', default=None)
+
+_listener = None
+_setup_lock = threading.Lock()
+
+class ScanContextFilter(logging.Filter):
+    """إرفاق scan_id والهدف بالسجل في سياق المستدعي"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.scan_id = current_scan_id.get()
+        record.target = current_target.get()
+        return True
+
+class WarningRateLimitFilter(logging.Filter):
+    """تحديد معدل التحذيرات المتكررة من نفس السطر"""
+
+    def __init__(self, burst: int, window: float):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._counters = {}  # (ملف، سطر) -> [بداية النافذة, العدد]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                suppressed = counter[1] - self.burst if counter and counter[1] > self.burst else 0
+                self._counters[key] = [now, 1]
+                if suppressed:
+                    record.msg = f"{record.msg} (تم كتم {suppressed} تحذير مشابه)"
+                return True
+
+            counter[1] += 1
+            return counter[1] <= self.burst
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler يحتفظ بمعلومات الاستثناء حتى تنسقها معالجات المستمع"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # الطابور داخل العملية نفسها، فلا حاجة لدمج التتبع في الرسالة كما يفعل الأصل
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """تنسيق السجلات كسطر JSON لكل سجل"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'scan_id': getattr(record, 'scan_id', None),
+            'target': getattr(record, 'target', None)
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logging(log_dir: Path, level: int = logging.INFO,
+                  filename: str = 'quantum_osint.log') -> Optional[logging.handlers.QueueListener]:
+    """إعداد التسجيل مرة واحدة؛ الاستدعاءات اللاحقة لا تفعل شيئاً
+
+    filename: ملف السجل داخل log_dir (لكل عملية عاملة ملف خاص بها).
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        log_dir.mkdir(exist_ok=True)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_dir / filename,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        )
+
+        # الكتابة الفعلية تتم في خيط المستمع وليس في حلقة الأحداث
+        log_queue = queue.SimpleQueue()
+        queue_handler = ContextQueueHandler(log_queue)
+        queue_handler.addFilter(ScanContextFilter())
+        queue_handler.addFilter(WarningRateLimitFilter(
+            settings.LOG_WARNING_BURST, settings.LOG_WARNING_WINDOW
+        ))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        return _listener
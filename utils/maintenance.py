@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+صيانة مجلدات التخزين: الاحتفاظ حسب العمر والحجم وضغط التصديرات
+"""
+
+import os
+import time
+import logging
+import threading
+import zipfile
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+
+from config.settings import settings
+
+# أنواع الملفات التي تضغط في الأرشيفات اليومية
+COMPACTABLE_SUFFIXES = ('.json', '.csv', '.html')
+
+class StorageMaintenance:
+    """تطبيق سياسات RETENTION_POLICIES على مجلدات المشروع"""
+
+    def __init__(self, base_dir: Path, policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = Path(base_dir)
+        self.policies = policies if policies is not None else settings.RETENTION_POLICIES
+        self.report = {
+            'runs': 0,
+            'reclaimed_bytes': 0,
+            'deleted_files': 0,
+            'compacted_files': 0,
+            'last_run': None
+        }
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, interval: float = None) -> threading.Thread:
+        """تشغيل الصيانة الدورية في خيط خلفي
+
+        خيط وليس مهمة asyncio لأن الواجهة التفاعلية تحجب حلقة الأحداث أثناء
+        انتظار input().
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, args=(interval or settings.MAINTENANCE_INTERVAL,),
+                name='quantum-maintenance', daemon=True
+            )
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """إيقاف الخيط بعد انتهاء الدورة الجارية"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"❌ فشلت صيانة التخزين: {e}")
+            self._stop.wait(interval)
+
+    def run_once(self) -> Dict[str, Any]:
+        """دورة صيانة واحدة لكل المجلدات"""
+        for dir_name, policy in self.policies.items():
+            directory = self.base_dir / dir_name
+            if not directory.is_dir():
+                continue
+
+            if policy.get('compact_after_days') is not None:
+                self._compact(directory, policy['compact_after_days'])
+
+            files = self._scan(directory, set(policy.get('protect', [])))
+            deleted = []
+
+            if policy.get('max_age_days') is not None:
+                cutoff = time.time() - policy['max_age_days'] * 86400
+                expired = [f for f in files if f[1] < cutoff]
+                deleted += self._delete(expired)
+                files = [f for f in files if f[1] >= cutoff]
+
+            if policy.get('max_size_mb') is not None:
+                deleted += self._enforce_size(files, policy['max_size_mb'] * 1024 * 1024)
+
+            # إزالة سجلات الملفات والأرشيفات المحذوفة من فهرس البحث
+            if dir_name == 'exports' and deleted:
+                from core.result_index import ResultIndex
+                ResultIndex().forget(deleted)
+
+        self.report['runs'] += 1
+        self.report['last_run'] = datetime.now().isoformat()
+
+        self.logger.info(
+            f"🧹 صيانة التخزين: تم تحرير {self.report['reclaimed_bytes'] / (1024**2):.1f} MB حتى الآن"
+        )
+        return self.report
+
+    def _scan(self, directory: Path, protect: set) -> List[tuple]:
+        """قائمة (المسار، وقت التعديل، الحجم) لملفات المجلد وأرشيفه بمرور واحد"""
+        files = []
+        for folder in (directory, directory / 'archive'):
+            if not folder.is_dir():
+                continue
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    # الملفات المخفية ملفات مؤقتة قيد الكتابة
+                    if entry.name.startswith('.') or entry.name in protect or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _delete(self, files: List[tuple]) -> List[str]:
+        """حذف ملفات وتسجيل المساحة المحررة؛ يعيد مسارات ما حُذف فعلاً"""
+        deleted = []
+        for path, _, size in files:
+            try:
+                os.unlink(path)
+            except OSError as e:
+                self.logger.warning(f"تعذر حذف {path}: {e}")
+                continue
+            deleted.append(path)
+            self.report['deleted_files'] += 1
+            self.report['reclaimed_bytes'] += size
+        return deleted
+
+    def _enforce_size(self, files: List[tuple], max_bytes: int) -> List[str]:
+        """حذف الأقدم استخداماً حتى يصبح الحجم ضمن الحد (LRU حسب وقت التعديل)"""
+        total = sum(size for _, _, size in files)
+        if total <= max_bytes:
+            return []
+
+        evicted = []
+        for entry in sorted(files, key=lambda f: f[1]):
+            if total <= max_bytes:
+                break
+            evicted.append(entry)
+            total -= entry[2]
+
+        return self._delete(evicted)
+
+    def _compact(self, directory: Path, after_days: float):
+        """ضم ملفات كل يوم الأقدم من after_days إلى أرشيف zip يومي"""
+        cutoff = time.time() - after_days * 86400
+        by_day = defaultdict(list)
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.name.endswith(COMPACTABLE_SUFFIXES) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    day = datetime.fromtimestamp(stat.st_mtime).strftime('%Y%m%d')
+                    by_day[day].append((Path(entry.path), stat.st_size))
+
+        if not by_day:
+            return
+
+        archive_dir = directory / 'archive'
+        archive_dir.mkdir(exist_ok=True)
+        moved = {}
+
+        for day, files in by_day.items():
+            archive_path = archive_dir / f"{directory.name}_{day}.zip"
+            size_before = archive_path.stat().st_size if archive_path.exists() else 0
+            archived = []
+
+            with zipfile.ZipFile(archive_path, 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+                existing = set(archive.namelist())
+                for path, size in files:
+                    if path.name not in existing:
+                        archive.write(path, arcname=path.name)
+                    archived.append((path, size))
+
+            for path, size in archived:
+                path.unlink()
+                moved[str(path)] = f"{archive_path}:{path.name}"
+
+            original = sum(size for _, size in archived)
+            self.report['compacted_files'] += len(archived)
+            self.report['reclaimed_bytes'] += original - (archive_path.stat().st_size - size_before)
+
+        # تحديث مسارات المصدر في فهرس البحث لتشير إلى الأرشيف
+        if directory.name == 'exports':
+            from core.result_index import ResultIndex
+            ResultIndex().relocate(moved)
@@ -4,18 +4,29 @@
 """
 
 import os
-import sys
+import time
 import asyncio
+import threading
 import aiohttp
 import logging
 from pathlib import Path
 
+from config.settings import settings
+from utils.maintenance import StorageMaintenance
+
 class ReplitEnvironment:
     """مدير بيئة Replit"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.base_dir = Path(__file__).parent.parent
+        
+        # نتائج فحص الاتصال لكل رابط: url -> (الحالة, وقت الفحص)
+        self._connectivity_cache = {}
+        self._connectivity_tasks = {}
+        
+        self.maintenance = StorageMaintenance(self.base_dir)
+        
         self.setup_environment()
     
     def setup_environment(self):
@@ -41,18 +52,9 @@ class ReplitEnvironment:
             self.logger.info(f"📁 إنشاء مجلد: {dir_name}")
     
     def setup_logging(self):
-        """إعداد نظام التسجيل"""
-        log_dir = self.base_dir / 'logs'
-        log_file = log_dir / 'quantum_osint.log'
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        """إعداد نظام التسجيل (مرة واحدة لكل عملية)"""
+        from utils.logging_setup import setup_logging
+        setup_logging(self.base_dir / 'logs')
     
     def check_resources(self):
         """فحص موارد Replit المتاحة"""
@@ -66,20 +68,49 @@ class ReplitEnvironment:
             'memory_total_gb': round(memory.total / (1024**3), 2),
             'memory_available_gb': round(memory.available / (1024**3), 2),
             'disk_free_gb': round(disk.free / (1024**3), 2),
-            'cpu_cores': psutil.cpu_count()
+            'cpu_cores': psutil.cpu_count(),
+            'storage_reclaimed_mb': round(self.maintenance.report['reclaimed_bytes'] / (1024**2), 2),
+            'storage_files_deleted': self.maintenance.report['deleted_files'],
+            'storage_files_compacted': self.maintenance.report['compacted_files'],
+            'storage_last_maintenance': self.maintenance.report['last_run']
         }
         
         self.logger.info(f"💾 موارد النظام: {resource_info}")
         return resource_info
     
-    async def check_internet(self):
-        """فحص اتصال الإنترنت"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://api.github.com', timeout=10) as response:
-                    return response.status == 200
-        except:
+    def start_maintenance(self) -> threading.Thread:
+        """تشغيل صيانة مجلدات التخزين في الخلفية"""
+        return self.maintenance.start()
+    
+    async def check_internet(self, url: str = 'https://api.github.com', force: bool = False) -> bool:
+        """فحص اتصال الإنترنت مع تخزين النتيجة لمدة CONNECTIVITY_CHECK_TTL"""
+        if settings.OFFLINE_MODE:
             return False
+        
+        cached = self._connectivity_cache.get(url)
+        if cached and not force and time.monotonic() - cached[1] < settings.CONNECTIVITY_CHECK_TTL:
+            return cached[0]
+        
+        try:
+            timeout = aiohttp.ClientTimeout(total=settings.CONNECTIVITY_CHECK_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.head(url) as response:
+                    status = response.status < 500
+        except Exception:
+            status = False
+        
+        self._connectivity_cache[url] = (status, time.monotonic())
+        if not status:
+            self.logger.warning(f"🌐 تعذر الوصول إلى {url}")
+        return status
+    
+    def start_connectivity_check(self, url: str) -> asyncio.Task:
+        """بدء فحص الاتصال في الخلفية دون انتظار نتيجته"""
+        task = self._connectivity_tasks.get(url)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self.check_internet(url))
+            self._connectivity_tasks[url] = task
+        return task
 
 class ReplitSecurity:
     """إجراءات أمان مخصصة لـ Replit"""
@@ -105,7 +136,7 @@ class ReplitSecurity:
         allowed_patterns = [
             r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$',  # إيميل
             r'^@?[a-zA-Z0-9_]{1,15}$',  # اسم مستخدم
-            r'^\+?[1-9]\d{1,14}$',  # رقم هاتف
+            r'^(?!\d{1,3}(?:\.\d{1,3}){3}$)(?!\d{4}[-./]\d{1,2}[-./]\d{1,2}$)(?!\d{1,2}[-./]\d{1,2}[-./]\d{2,4}$)(?=(?:\D*\d){2,17}\D*$)\+?[\d\s().-]+$',  # رقم هاتف (دولي أو محلي مع فواصل، وليس عنوان IP أو تاريخاً)
             r'^[a-zA-Z0-9-]+\.[a-zA-Z]{2,}$'  # نطاق
         ]
         